@@ -1,19 +1,139 @@
-from flask import Flask, render_template, jsonify, request
-from flask_socketio import SocketIO, emit
+# Serve Socket.IO from eventlet green threads when available so many WebSocket
+# clients don't each hold an OS thread. Patching must happen before anything
+# else imports socket/threading.
+try:
+    import eventlet
+    import eventlet.tpool
+    eventlet.monkey_patch()
+    ASYNC_MODE = 'eventlet'
+except ImportError:
+    eventlet = None
+    ASYNC_MODE = 'threading'
+
+from flask import Flask, render_template, jsonify, request, Response
+from flask.json.provider import DefaultJSONProvider
+from flask_socketio import SocketIO, emit, join_room, leave_room
+from socketio import packet as sio_packet
+from engineio import packet as eio_packet
 from apscheduler.schedulers.background import BackgroundScheduler
 from apscheduler.triggers.interval import IntervalTrigger
 import atexit
+import base64
+import functools
+import json
+import logging
+import logging.handlers
+import queue
+import re
 import threading
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 import socket
 import os
 import signal
 import sys
+from collections import OrderedDict
 from datetime import datetime
-from chat_processor import ChatProcessor
+from chat_processor import ChatProcessor, init_stylometry_worker, stylometry_worker
+
+try:
+    import orjson
+    ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SORT_KEYS | orjson.OPT_SERIALIZE_NUMPY
+except ImportError:
+    # Fall back to Flask's stdlib json provider
+    orjson = None
+
+try:
+    from watchdog.observers import Observer
+    from watchdog.events import FileSystemEventHandler
+except ImportError:
+    # Without watchdog we fall back to interval polling only
+    Observer = None
+    FileSystemEventHandler = object
+
+try:
+    import psutil
+except ImportError:
+    # Port cleanup is skipped without psutil
+    psutil = None
+
+class ORJSONProvider(DefaultJSONProvider):
+    """Flask JSON provider backed by orjson, which is much faster on large payloads"""
+    
+    def dumps_bytes(self, obj):
+        """Serialize straight to UTF-8 bytes"""
+        return orjson.dumps(obj, default=self.default, option=ORJSON_OPTIONS)
+    
+    def dumps(self, obj, **kwargs):
+        # Formatting options (indent, separators, ...) only exist in the stdlib encoder
+        if kwargs:
+            return super().dumps(obj, **kwargs)
+        return self.dumps_bytes(obj).decode('utf-8')
+    
+    def loads(self, s, **kwargs):
+        if kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+    
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        if (self.compact is None and self._app.debug) or self.compact is False:
+            return super().response(obj)
+        return self._app.response_class(self.dumps_bytes(obj), mimetype=self.mimetype)
+
+def setup_logging(level=logging.INFO):
+    """Send log records through a queue so formatting and terminal writes happen on a listener thread"""
+    log_queue = queue.Queue(-1)
+    stream_handler = logging.StreamHandler(sys.stdout)
+    stream_handler.setFormatter(logging.Formatter('%(message)s'))
+    listener = logging.handlers.QueueListener(log_queue, stream_handler)
+    root = logging.getLogger()
+    root.setLevel(level)
+    root.addHandler(logging.handlers.QueueHandler(log_queue))
+    # APScheduler logs every job run at INFO
+    logging.getLogger('apscheduler').setLevel(logging.WARNING)
+    listener.start()
+    # Flush anything still queued on shutdown
+    atexit.register(listener.stop)
+    return listener
+
+setup_logging()
+logger = logging.getLogger(__name__)
+
+class ORJSONCodec:
+    """json-module stand-in (dumps/loads) so Socket.IO packets are encoded with orjson"""
+    
+    @staticmethod
+    def dumps(obj, *args, **kwargs):
+        # Packet encoding passes stdlib options such as separators; orjson output is already compact
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY).decode('utf-8')
+    
+    @staticmethod
+    def loads(s, *args, **kwargs):
+        return orjson.loads(s)
 
 app = Flask(__name__)
 app.config['SECRET_KEY'] = 'your-secret-key-here'
-socketio = SocketIO(app, cors_allowed_origins="*")
+if orjson is not None:
+    app.json = ORJSONProvider(app)
+socketio = SocketIO(app, async_mode=ASYNC_MODE, cors_allowed_origins="*",
+                    json=ORJSONCodec if orjson is not None else json)
+
+class NoWebSocketCompression:
+    """WSGI middleware that declines permessage-deflate on WebSocket upgrades"""
+    
+    def __init__(self, wsgi_app):
+        self.wsgi_app = wsgi_app
+    
+    def __call__(self, environ, start_response):
+        # Broadcasts are encoded once and sent to every client; with deflate
+        # negotiated each connection would compress the same bytes again and
+        # keep its own zlib context alive
+        environ.pop('HTTP_SEC_WEBSOCKET_EXTENSIONS', None)
+        return self.wsgi_app(environ, start_response)
+
+app.wsgi_app = NoWebSocketCompression(app.wsgi_app)
 
 # Global processor instance
 processor = ChatProcessor()
@@ -21,32 +141,571 @@ processor = ChatProcessor()
 # Background scheduler for periodic updates
 scheduler = BackgroundScheduler()
 
-def process_and_update():
-    """Background task to process new chat data and update analytics"""
+# Log changes are picked up by the file watcher; polling is only a safety net
+CHANNELS_DIR = "Channels"
+WATCH_DEBOUNCE_SECONDS = 2.0
+POLL_INTERVAL_SECONDS = 60
+WATCHED_POLL_INTERVAL_SECONDS = 300
+POLL_MAX_INTERVAL_SECONDS = 900
+_update_lock = threading.Lock()
+
+class PollBackoff:
+    """Stretch the scheduler's poll interval while no new messages arrive"""
+    
+    def __init__(self, job_id='process_chats', max_seconds=POLL_MAX_INTERVAL_SECONDS):
+        self.job_id = job_id
+        self.max_seconds = max_seconds
+        self.base = POLL_INTERVAL_SECONDS
+        self.seconds = self.base
+        self.idle_ticks = 0
+    
+    def start(self, base):
+        """Set the interval the poll job was scheduled with"""
+        self.base = self.seconds = base
+        self.idle_ticks = 0
+    
+    def record(self, new_messages):
+        """Double the interval after an idle run (up to the cap) and reset it on activity"""
+        if new_messages:
+            self.idle_ticks = 0
+        elif self.seconds < self.max_seconds:
+            self.idle_ticks += 1
+        seconds = min(self.base * 2 ** self.idle_ticks, max(self.base, self.max_seconds))
+        if seconds == self.seconds:
+            return
+        self.seconds = seconds
+        if scheduler.get_job(self.job_id) is not None:
+            scheduler.reschedule_job(self.job_id, trigger=IntervalTrigger(seconds=seconds))
+            logger.info(f"  Next poll in {seconds}s")
+
+poll_backoff = PollBackoff()
+
+# Worker pool for overlapping independent DB queries within a single request
+_io_pool = ThreadPoolExecutor(max_workers=8)
+atexit.register(_io_pool.shutdown)
+USER_DETAIL_TIMEOUT = 30.0  # seconds, matches the DB connection timeout
+
+def run_blocking(func, *args):
+    """Run blocking SQLite/analysis work on a real OS thread so the eventlet hub keeps serving clients"""
+    if eventlet is not None:
+        return eventlet.tpool.execute(func, *args)
+    return func(*args)
+
+def submit_io(func, *args):
+    """Submit a blocking DB query to the I/O pool"""
+    return _io_pool.submit(run_blocking, func, *args)
+
+# Stylometry is CPU-bound, so it runs in worker processes that load their own
+# messages; only the channel name and filter are sent over, only groups come back
+_stylometry_pool = ProcessPoolExecutor(
+    max_workers=os.cpu_count(),
+    initializer=init_stylometry_worker,
+    initargs=(processor.db.db_path,)
+)
+atexit.register(_stylometry_pool.shutdown)
+
+def run_stylometry(channel_name, date_filter):
+    """Group a channel's users by writing style in a worker process; must not be called from run_blocking"""
+    return _stylometry_pool.submit(stylometry_worker, channel_name, date_filter).result()
+
+def encode_cursor(timestamp, message_id):
+    """Encode a (timestamp, id) keyset position as an opaque cursor string"""
+    raw = json.dumps([timestamp, message_id]).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii')
+
+def decode_cursor(cursor):
+    """Decode a cursor produced by encode_cursor, raising ValueError if malformed"""
     try:
-        print(f"[{datetime.now()}] Starting periodic update...")
-        
-        # Process all channels for new messages
-        results = processor.process_all_channels()
-        
-        total_new_messages = 0
-        for channel, (messages, files) in results.items():
-            total_new_messages += messages
-            if messages > 0:
-                print(f"  {channel}: {messages} new messages from {files} files")
-                # Update analytics for this channel
-                processor.update_user_analytics(channel)
-        
-        if total_new_messages > 0:
-            print(f"  Total: {total_new_messages} new messages processed")
-            # Emit update to all connected clients
-            summary = processor.get_all_channels_summary()
-            socketio.emit('data_update', {'channels': summary}, broadcast=True)
+        timestamp, message_id = json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')))
+    except Exception:
+        raise ValueError('Invalid cursor')
+    if not isinstance(timestamp, str) or not isinstance(message_id, int):
+        raise ValueError('Invalid cursor')
+    return timestamp, message_id
+
+# The summary also expires after this long, to pick up writes made by other
+# processes (e.g. init_database.py) that can't invalidate this cache
+SUMMARY_TTL = 60.0  # seconds
+
+# Cached channel bodies are stored split around this placeholder for their top-level
+# last_updated, so every response is stamped with the time it was served
+_LAST_UPDATED_MARK = f"__last_updated_{uuid.uuid4().hex}__"
+
+def split_last_updated(payload):
+    """Serialize a channel payload into the JSON before and after its last_updated value"""
+    head, tail = app.json.dumps({**payload, 'last_updated': _LAST_UPDATED_MARK}).split(
+        json.dumps(_LAST_UPDATED_MARK))
+    return head, tail
+
+def stamp_last_updated(parts):
+    """Join a split channel payload around the current time as its last_updated"""
+    head, tail = parts
+    return f"{head}{json.dumps(datetime.now().isoformat())}{tail}"
+
+class SummaryCache:
+    """All-channels summary shared by the HTTP, SocketIO and scheduler paths, kept
+    alongside its serialized JSON so repeated requests and connects are O(1).
+    
+    ``version`` is bumped whenever new data lands; the summary is rebuilt on the
+    next read after an invalidation or once the TTL has passed. ``generation``
+    counts rebuilds and identifies the cached body (used for ETags).
+    """
+    
+    def __init__(self, ttl=SUMMARY_TTL):
+        self.ttl = ttl
+        self.version = 0
+        self.generation = 0
+        self._built_version = -1
+        self._built_at = 0.0
+        self._payload = None
+        self._json = None
+        self._packets = None
+        self._channel_json = {}
+        self._lock = threading.Lock()
+    
+    def invalidate(self):
+        """Mark the cached summary as stale"""
+        with self._lock:
+            self.version += 1
+    
+    def snapshot(self):
+        """Return (summary, serialized JSON, generation), rebuilding only when stale"""
+        with self._lock:
+            if (self._built_version != self.version or
+                    time.monotonic() - self._built_at >= self.ttl):
+                built_version = self.version
+                summary = run_blocking(processor.get_all_channels_summary)
+                self._payload = summary
+                self._json = app.json.dumps({'channels': summary})
+                # data_update frames reuse the serialized JSON instead of encoding it again
+                self._packets = _encode_json_event('data_update', self._json)
+                self._channel_json = {}
+                self._built_version = built_version
+                self._built_at = time.monotonic()
+                self.generation += 1
+            return self._payload, self._json, self.generation
+    
+    def get(self):
+        """Return (summary, serialized JSON), rebuilding only when stale"""
+        summary, summary_json, _ = self.snapshot()
+        return summary, summary_json
+    
+    def packets(self):
+        """Return the Engine.IO packets of a data_update event carrying the summary"""
+        self.snapshot()
+        return self._packets
+    
+    def channel_json(self, channel_name):
+        """Return one channel's summary row as serialized JSON, or None if it has no data"""
+        summary, _, _ = self.snapshot()
+        with self._lock:
+            row_parts = self._channel_json.get(channel_name)
+            if row_parts is None:
+                row = next((row for row in summary if row['channel'] == channel_name), None)
+                if row is None:
+                    return None
+                row_parts = self._channel_json[channel_name] = split_last_updated(row)
+        return stamp_last_updated(row_parts)
+
+summary_cache = SummaryCache()
+
+# Versions restart at 0 with the process, so ETags also carry a per-boot token
+_BOOT_ID = uuid.uuid4().hex[:8]
+
+# Cached JSON bodies are written out in chunks of this many characters
+JSON_STREAM_CHUNK = 64 * 1024
+
+def json_stream_response(body):
+    """Stream a serialized JSON body in UTF-8 chunks instead of encoding it whole per request"""
+    def generate():
+        for start in range(0, len(body), JSON_STREAM_CHUNK):
+            yield body[start:start + JSON_STREAM_CHUNK].encode('utf-8')
+    return Response(generate(), mimetype='application/json')
+
+def conditional_response(response, version):
+    """Tag a response with the data version and turn it into a 304 if the client is current"""
+    response.set_etag(f"{_BOOT_ID}-v{version}")
+    response.cache_control.no_cache = True
+    return response.make_conditional(request)
+
+def content_conditional_response(response):
+    """Tag a response with a hash of its body and turn it into a 304 if the client is current"""
+    # The body is read from the database on every request, so the tag follows
+    # writes made by other processes (e.g. init_database.py) as well
+    response.add_etag()
+    response.cache_control.no_cache = True
+    return response.make_conditional(request)
+
+# Date filters: "2024-01-01", "2024-01-01:2024-01-31", "include:<date>,<date>" or "exclude:<date>,<date>"
+_DATE = r'\d{4}-\d{2}-\d{2}'
+_DATE_FILTER_RE = re.compile(rf'(?:(include|exclude):({_DATE}(?:,{_DATE})*)|({_DATE})(?::({_DATE}))?)')
+
+def parse_date_filter(date_filter):
+    """Validate a date filter and return the (start_date, end_date) it spans; raises ValueError if malformed"""
+    match = _DATE_FILTER_RE.fullmatch(date_filter)
+    if not match:
+        raise ValueError(f'Invalid date filter: {date_filter}')
+    mode, dates, start_date, end_date = match.groups()
+    if mode == 'include':
+        dates = dates.split(',')
+        return min(dates), max(dates)
+    if mode == 'exclude':
+        # The remaining span depends on the channel's data, so leave it open
+        return None, None
+    return start_date, end_date or start_date
+
+@functools.lru_cache(maxsize=64)
+def _stylometry_cached(channel_name, date_filter, msg_version):
+    """Group a channel's users by writing style; cached per (channel, filter, message count)"""
+    return run_stylometry(channel_name, date_filter)
+
+def invalidate_channel_data():
+    """Drop cached summaries and stylometry results after new data lands"""
+    summary_cache.invalidate()
+    _stylometry_cached.cache_clear()
+
+# Date-filtered payloads are kept per (channel, filter) view, least recently used first;
+# each view holds only the body for its latest message count
+FILTERED_PAYLOAD_CACHE_SIZE = 64
+_filtered_payloads = OrderedDict()  # (channel, date_filter) -> (message count, split payload)
+_filtered_payloads_lock = threading.Lock()
+
+def _filtered_channel_payload(channel_name, date_filter, start_date, end_date, msg_version):
+    """Build the date-filtered channel payload, serialized and split around its last_updated"""
+    db = processor.db
+    chat_counts = run_blocking(db.get_user_chat_counts, channel_name, date_filter)
+    
+    if len(chat_counts) < 2:
+        # Nothing to compare; skip loading messages and the stylometry pass
+        groups, alt_scores, similar_users = [[u] for u in chat_counts], {}, {}
+    else:
+        # Perform stylometry analysis on filtered data; like this payload, it is cached per
+        # filtered message count, so rows written by other processes such as
+        # init_database.py miss both caches
+        groups, alt_scores, similar_users = _stylometry_cached(channel_name, date_filter, msg_version)
+    
+    # Convert to user stats format
+    user_stats = []
+    total_messages = 0
+    # Each user's latest message time, in one grouped query
+    last_timestamps = run_blocking(db.get_user_last_timestamps, channel_name, date_filter)
+    # Bind the lookups once; this loop runs per user in the channel
+    get_alt = alt_scores.get
+    get_similar = similar_users.get
+    get_last_timestamp = last_timestamps.get
+    # chat_counts is already ordered by chat count (descending) from SQL
+    for username, chat_count in chat_counts.items():
+        total_messages += chat_count
+        alt_likelihood = get_alt(username, 0.0) * 100
+        similar_user_list = get_similar(username, [])
+        last_msg = get_last_timestamp(username)
+        user_stats.append({
+            'username': username,
+            'chat_count': chat_count,
+            'alt_likelihood': alt_likelihood,
+            'similar_users': similar_user_list,
+            'last_updated': last_msg
+        })
+    # last_updated is filled in per response
+    return split_last_updated({
+        'channel': channel_name,
+        'user_stats': user_stats,
+        'start_date': start_date,
+        'end_date': end_date,
+        'unique_user_count': len(groups),
+        'total_users': len(user_stats),
+        'total_messages': total_messages
+    })
+
+def channel_payload_json(channel_name, date_filter=None):
+    """Get serialized channel data for the HTTP and SocketIO channel endpoints"""
+    if date_filter:
+        start_date, end_date = parse_date_filter(date_filter)
+        # Stylometry on filtered data is expensive, so reuse it until the filtered message
+        # count changes; the payload is built on this greenlet while queries and stylometry run elsewhere
+        msg_version = run_blocking(processor.db.get_total_messages_count, channel_name, date_filter)
+        view = (channel_name, date_filter)
+        with _filtered_payloads_lock:
+            cached = _filtered_payloads.get(view)
+            if cached is not None and cached[0] == msg_version:
+                _filtered_payloads.move_to_end(view)
+                return stamp_last_updated(cached[1])
+        payload_parts = _filtered_channel_payload(channel_name, date_filter,
+                                                  start_date, end_date, msg_version)
+        with _filtered_payloads_lock:
+            # Replaces the body built for an older message count, if any
+            _filtered_payloads[view] = (msg_version, payload_parts)
+            _filtered_payloads.move_to_end(view)
+            while len(_filtered_payloads) > FILTERED_PAYLOAD_CACHE_SIZE:
+                _filtered_payloads.popitem(last=False)
+        return stamp_last_updated(payload_parts)
+    # The unfiltered payload is the channel's row of the cached summary
+    payload_json = summary_cache.channel_json(channel_name)
+    if payload_json is None:
+        payload_json = app.json.dumps(run_blocking(processor.get_channel_summary, channel_name))
+    return payload_json
+
+# Clients receive broadcasts in batches of this size, yielding to the event loop in between
+BROADCAST_BATCH_SIZE = 50
+
+# Events are encoded once into Engine.IO MESSAGE packets shared by every client. The
+# encoding follows the Socket.IO v5 protocol and was checked against python-socketio
+# 5.17.0 / python-engineio 4.14.0 (the versions pinned in requirements.txt)
+
+def _encode_event(event, payload):
+    """Encode an event once into the Engine.IO packets sent to every client"""
+    packet_class = getattr(socketio.server, 'packet_class', sio_packet.Packet)
+    pkt = packet_class(sio_packet.EVENT, namespace='/', data=[event, payload])
+    encoded = pkt.encode()
+    if not isinstance(encoded, list):
+        encoded = [encoded]
+    return [eio_packet.Packet(eio_packet.MESSAGE, p) for p in encoded]
+
+def _encode_json_event(event, payload_json):
+    """Build the Engine.IO packet of an event whose payload is already serialized JSON"""
+    event_json = json.dumps(event)
+    return [eio_packet.Packet(eio_packet.MESSAGE, f'{sio_packet.EVENT}[{event_json},{payload_json}]')]
+
+def send_packets(eio_sid, eio_pkts):
+    """Queue pre-encoded packets for a single client"""
+    # Server._send_eio_packet is private to python-socketio; releases without it
+    # get the same MESSAGE data through engineio's public Server.send
+    send_eio_packet = getattr(socketio.server, '_send_eio_packet', None)
+    for p in eio_pkts:
+        if send_eio_packet is not None:
+            send_eio_packet(eio_sid, p)
         else:
-            print("  No new messages to process")
+            socketio.server.eio.send(eio_sid, p.data)
+
+def broadcast_in_batches(event, payload, batch_size=BROADCAST_BATCH_SIZE, room=None):
+    """Emit an event to every connected client (or a room's members) in batches, yielding between batches"""
+    # Serialize the payload a single time rather than once per client
+    send_in_batches(_encode_event(event, payload), batch_size, room)
+
+def send_in_batches(eio_pkts, batch_size=BROADCAST_BATCH_SIZE, room=None):
+    """Send pre-encoded packets to every connected client (or a room's members) in batches"""
+    eio_sids = [eio_sid for _, eio_sid in socketio.server.manager.get_participants('/', room)]
+    for start in range(0, len(eio_sids), batch_size):
+        for eio_sid in eio_sids[start:start + batch_size]:
+            send_packets(eio_sid, eio_pkts)
+        socketio.sleep(0)
+
+def broadcast(event, payload):
+    """Fan an event out to all clients from a background task"""
+    socketio.start_background_task(broadcast_in_batches, event, payload)
+
+# data_update is latest-wins: updates landing within this window reach each client
+# as one newest summary, and clients with a backlog are skipped until they catch up
+SUMMARY_BROADCAST_INTERVAL = 0.1  # seconds
+SUMMARY_MAX_BACKLOG = 8  # packets queued for a client before it counts as slow
+
+class SummaryBroadcaster:
+    """Deliver data_update to clients so that a stale summary is never queued behind a newer one"""
+    
+    def __init__(self, interval=SUMMARY_BROADCAST_INTERVAL, max_backlog=SUMMARY_MAX_BACKLOG):
+        self.interval = interval
+        self.max_backlog = max_backlog
+        self.pending = set()  # eio sids owed the newest summary
+        self.draining = False
+        self._lock = threading.Lock()
+    
+    def schedule(self):
+        """Mark every connected client as owed the newest summary"""
+        eio_sids = [eio_sid for _, eio_sid in socketio.server.manager.get_participants('/', None)]
+        with self._lock:
+            self.pending.update(eio_sids)
+            if self.draining:
+                return
+            self.draining = True
+        socketio.start_background_task(self._drain)
+    
+    def discard(self, eio_sid):
+        """Forget a client that disconnected"""
+        with self._lock:
+            self.pending.discard(eio_sid)
+    
+    def _backlogged(self, eio_sid):
+        """Whether a client still has more than max_backlog packets waiting to be written"""
+        # The per-socket send queue is engineio internals (checked against python-engineio
+        # 4.14.0); without it no client counts as backlogged and every update is sent
+        sockets = getattr(socketio.server.eio, 'sockets', None)
+        sock = sockets.get(eio_sid) if sockets is not None else None
+        send_queue = getattr(sock, 'queue', None)
+        return send_queue is not None and send_queue.qsize() > self.max_backlog
+    
+    def _drain(self):
+        """Send the summary current at each tick to the clients owed one, until none are"""
+        while True:
+            socketio.sleep(self.interval)
+            with self._lock:
+                eio_sids, self.pending = list(self.pending), set()
+                if not eio_sids:
+                    self.draining = False
+                    return
+            eio_pkts = summary_cache.packets()
+            deferred = []
+            for start in range(0, len(eio_sids), BROADCAST_BATCH_SIZE):
+                for eio_sid in eio_sids[start:start + BROADCAST_BATCH_SIZE]:
+                    if self._backlogged(eio_sid):
+                        deferred.append(eio_sid)
+                    else:
+                        send_packets(eio_sid, eio_pkts)
+                socketio.sleep(0)
+            if deferred:
+                with self._lock:
+                    self.pending.update(deferred)
+
+summary_broadcaster = SummaryBroadcaster()
+
+def broadcast_summary():
+    """Queue the newest data_update for all clients"""
+    summary_broadcaster.schedule()
+
+# Clients viewing a channel join a room per (channel, date filter), so fresh
+# channel data is built once per view and pushed only to the clients showing it
+_channel_views = {}  # sid -> (channel_name, date_filter)
+
+def channel_room(channel_name, date_filter=None):
+    """Room name for clients viewing a channel with a given date filter"""
+    return f"ch:{channel_name}|{date_filter or ''}"
+
+def watch_channel(sid, channel_name, date_filter=None):
+    """Move a client into the room for the channel view it just requested"""
+    view = (channel_name, date_filter or None)
+    previous = _channel_views.get(sid)
+    if previous == view:
+        return
+    if previous:
+        leave_room(channel_room(*previous))
+    join_room(channel_room(*view))
+    _channel_views[sid] = view
+
+def unwatch_channel(sid):
+    """Take a client out of its channel view room"""
+    previous = _channel_views.pop(sid, None)
+    if previous:
+        leave_room(channel_room(*previous))
+
+def push_channel_views(channels):
+    """Send fresh channel_data to every room viewing one of the given channels"""
+    channels = set(channels)
+    for view in set(_channel_views.values()):
+        if view[0] not in channels:
+            continue
+        try:
+            payload_json = channel_payload_json(*view)
+        except Exception as e:
+            logger.warning(f"Warning: Could not refresh {view[0]} for viewers: {e}")
+            continue
+        send_in_batches(_encode_json_event('channel_data', payload_json), room=channel_room(*view))
+
+def broadcast_channel_views(channels):
+    """Push channel_data for updated channels to their viewers from a background task"""
+    if channels:
+        socketio.start_background_task(push_channel_views, list(channels))
+
+# Per-channel summary rows are coalesced and sent as data_patch at most this often
+PATCH_FLUSH_INTERVAL = 0.5  # seconds
+PATCH_MAX_CHANNELS = 50
+
+class ChannelPatchBuffer:
+    """Collect updated channel summary rows and broadcast them as data_patch deltas"""
+    
+    def __init__(self, interval=PATCH_FLUSH_INTERVAL, max_channels=PATCH_MAX_CHANNELS):
+        self.interval = interval
+        self.max_channels = max_channels
+        self.pending = {}
+        self.last_flush = time.monotonic()
+    
+    def add(self, channel, row):
+        """Queue a channel's summary row, flushing if the window has elapsed or the batch is full"""
+        self.pending[channel] = row
+        if (len(self.pending) >= self.max_channels or
+                time.monotonic() - self.last_flush >= self.interval):
+            self.flush()
+    
+    def flush(self):
+        """Broadcast all pending rows, at most max_channels per event"""
+        rows = list(self.pending.values())
+        self.pending.clear()
+        self.last_flush = time.monotonic()
+        for start in range(0, len(rows), self.max_channels):
+            broadcast_in_batches('data_patch', {'channels': rows[start:start + self.max_channels]})
+
+def process_and_update():
+    """Background task to process new chat data and update analytics"""
+    # The watcher and the fallback poll can both fire; run one update at a time
+    with _update_lock:
+        try:
+            logger.info(f"[{datetime.now()}] Starting periodic update...")
             
-    except Exception as e:
-        print(f"Error in periodic update: {e}")
+            # Process all channels for new messages
+            results = run_blocking(processor.process_all_channels)
+            
+            total_new_messages = 0
+            updated_channels = []
+            for channel, (messages, files) in results.items():
+                total_new_messages += messages
+                if messages > 0:
+                    logger.info(f"  {channel}: {messages} new messages from {files} files")
+                    updated_channels.append(channel)
+            
+            # Update analytics for all changed channels in one transaction
+            run_blocking(processor.update_user_analytics_batch, updated_channels)
+            
+            if total_new_messages > 0:
+                logger.info(f"  Total: {total_new_messages} new messages processed")
+                invalidate_channel_data()
+                # Emit update to all connected clients
+                broadcast_summary()
+                broadcast_channel_views(updated_channels)
+            else:
+                logger.info("  No new messages to process")
+            poll_backoff.record(total_new_messages)
+        
+        except Exception as e:
+            logger.error(f"Error in periodic update: {e}")
+
+class ChatLogWatcher(FileSystemEventHandler):
+    """Trigger processing when chat log files change, coalescing bursts of events"""
+    
+    def __init__(self, delay=WATCH_DEBOUNCE_SECONDS):
+        super().__init__()
+        self.delay = delay
+        self._timer = None
+        self._lock = threading.Lock()
+    
+    def on_any_event(self, event):
+        if event.is_directory or event.event_type not in ('created', 'modified', 'moved'):
+            return
+        path = getattr(event, 'dest_path', '') or event.src_path
+        if not path.endswith('.log'):
+            return
+        # Restart the debounce timer so a burst of writes triggers one update
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+            self._timer = threading.Timer(self.delay, self._fire)
+            self._timer.daemon = True
+            self._timer.start()
+    
+    def _fire(self):
+        socketio.start_background_task(process_and_update)
+
+def start_log_watcher(path=CHANNELS_DIR):
+    """Watch the chat log directory for changes; returns the observer or None"""
+    if Observer is None:
+        logger.warning("⚠️  watchdog not installed - falling back to periodic polling")
+        return None
+    if not os.path.isdir(path):
+        logger.warning(f"⚠️  {path} directory not found - falling back to periodic polling")
+        return None
+    observer = Observer()
+    observer.schedule(ChatLogWatcher(), path, recursive=True)
+    observer.daemon = True
+    observer.start()
+    logger.info(f"👀 Watching {path} for new chat logs")
+    return observer
 
 @app.route('/')
 def index():
@@ -58,7 +717,7 @@ def get_channels():
     """Get list of all channels"""
     try:
         channels = processor.db.get_channels()
-        return jsonify({'channels': channels})
+        return content_conditional_response(jsonify({'channels': channels}))
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -67,7 +726,7 @@ def get_channel_dates(channel_name):
     """Get available dates for a specific channel"""
     try:
         dates = processor.db.get_available_dates(channel_name)
-        return jsonify({'dates': dates})
+        return content_conditional_response(jsonify({'dates': dates}))
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -77,54 +736,9 @@ def get_channel_data(channel_name):
     try:
         date_filter = request.args.get('date_filter')
         
-        # If date filter is provided, get filtered data
-        if date_filter:
-            chat_counts = processor.db.get_user_chat_counts(channel_name, date_filter)
-            user_messages = processor.db.get_user_messages(channel_name, date_filter)
-            
-            # Perform stylometry analysis on filtered data
-            groups, alt_scores, similar_users = processor.group_users_by_stylometry(user_messages)
-            
-            # Convert to user stats format
-            user_stats = []
-            # Fetch timestamps once using the DB helper to avoid manual connection management
-            user_timestamps = processor.db.get_user_timestamps(channel_name, date_filter)
-            for username in chat_counts:
-                chat_count = chat_counts[username]
-                alt_likelihood = alt_scores.get(username, 0.0) * 100
-                similar_user_list = similar_users.get(username, [])
-                # timestamps are ordered; take last element if present
-                ts_list = user_timestamps.get(username, [])
-                last_msg = ts_list[-1] if ts_list else None
-                user_stats.append({
-                    'username': username,
-                    'chat_count': chat_count,
-                    'alt_likelihood': alt_likelihood,
-                    'similar_users': similar_user_list,
-                    'last_updated': last_msg
-                })
-            # Sort by chat count
-            user_stats.sort(key=lambda x: x['chat_count'], reverse=True)
-            # Get date range for filtered data
-            if ':' in date_filter:
-                start_date, end_date = date_filter.split(':')
-            else:
-                start_date = end_date = date_filter
-            return jsonify({
-                'channel': channel_name,
-                'user_stats': user_stats,
-                'start_date': start_date,
-                'end_date': end_date,
-                'unique_user_count': len(groups),
-                'total_users': len(user_stats),
-                'total_messages': sum(stat['chat_count'] for stat in user_stats),
-                'last_updated': datetime.now().isoformat()
-            })
-        else:
-            # Get cached data from database
-            summary = processor.get_channel_summary(channel_name)
-            return jsonify(summary)
-            
+        return json_stream_response(channel_payload_json(channel_name, date_filter))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -132,8 +746,8 @@ def get_channel_data(channel_name):
 def get_summary():
     """Get summary of all channels"""
     try:
-        summary = processor.get_all_channels_summary()
-        return jsonify({'channels': summary})
+        _, summary_json, version = summary_cache.snapshot()
+        return conditional_response(json_stream_response(summary_json), version)
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -143,54 +757,66 @@ def get_user_details(username):
     try:
         channel = request.args.get('channel')
         date_filter = request.args.get('date_filter')
-        page = int(request.args.get('page', 1))
+        cursor = request.args.get('cursor')
         limit = int(request.args.get('limit', 100))
         
         if not channel:
             return jsonify({'error': 'Channel parameter required'}), 400
         
-        # Get user's basic stats
-        user_stats = processor.db.get_user_stats(channel)
-        user_stat = next((stat for stat in user_stats if stat['username'] == username), None)
+        try:
+            after = decode_cursor(cursor) if cursor else None
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
         
-        if not user_stat:
-            return jsonify({'error': 'User not found'}), 404
+        db = processor.db
         
-        # Get user's messages with pagination
-        user_messages = processor.db.get_user_messages_paginated(
-            channel, username, date_filter, page, limit
-        )
+        # The detail queries are independent and I/O-bound (each opens its own
+        # connection), so run them concurrently while the stats lookup runs here
+        futures = {
+            'messages': submit_io(
+                db.get_user_messages_paginated, channel, username, date_filter, 1, limit, after
+            ),
+            'channels': submit_io(db.get_user_channels, username),
+            'activity_timeline': submit_io(
+                db.get_user_activity_timeline, channel, username, date_filter
+            ),
+            'temporal_analysis': submit_io(
+                db.get_user_temporal_analysis, channel, username, date_filter
+            ),
+            'behavioral_insights': submit_io(
+                db.get_user_behavioral_insights, channel, username, date_filter
+            ),
+        }
         
-        # Get user's channel activity (which channels they're active in)
-        user_channels = processor.db.get_user_channels(username)
+        # Get user's basic stats
+        user_stat = run_blocking(db.get_user_stat, channel, username)
         
-        # Get user's activity timeline
-        activity_timeline = processor.db.get_user_activity_timeline(
-            channel, username, date_filter
-        )
+        if not user_stat:
+            for future in futures.values():
+                future.cancel()
+            return jsonify({'error': 'User not found'}), 404
         
-        # Get detailed temporal analysis
-        temporal_analysis = processor.db.get_user_temporal_analysis(
-            channel, username, date_filter
-        )
-        
-        # Get behavioral insights
-        behavioral_insights = processor.db.get_user_behavioral_insights(
-            channel, username, date_filter
-        )
+        details = {key: future.result(timeout=USER_DETAIL_TIMEOUT) for key, future in futures.items()}
+        user_messages = details['messages']
+        has_more = len(user_messages) == limit
+        next_cursor = None
+        if has_more:
+            last = user_messages[-1]
+            next_cursor = encode_cursor(last['timestamp'], last['id'])
         
         return jsonify({
             'username': username,
             'stats': user_stat,
             'messages': user_messages,
-            'channels': user_channels,
-            'activity_timeline': activity_timeline,
-            'temporal_analysis': temporal_analysis,
-            'behavioral_insights': behavioral_insights,
+            'channels': details['channels'],
+            'activity_timeline': details['activity_timeline'],
+            'temporal_analysis': details['temporal_analysis'],
+            'behavioral_insights': details['behavioral_insights'],
             'pagination': {
-                'page': page,
+                'cursor': cursor,
                 'limit': limit,
-                'has_more': len(user_messages) == limit
+                'has_more': has_more,
+                'next_cursor': next_cursor
             }
         })
         
@@ -201,18 +827,26 @@ def get_user_details(username):
 def manual_process():
     """Manually trigger processing of all channels"""
     try:
-        print("Manual processing triggered...")
-        results = processor.process_all_channels()
+        logger.info("Manual processing triggered...")
+        results = run_blocking(processor.process_all_channels)
         
-        # Update analytics for all channels with new data
-        for channel, (messages, files) in results.items():
-            if messages > 0:
-                processor.update_user_analytics(channel)
+        # Update analytics for all channels with new data in one transaction
+        updated_channels = [channel for channel, (messages, files) in results.items() if messages > 0]
+        if not updated_channels:
+            # Clients already have the current data; skip the roll-up and the broadcast
+            return jsonify({
+                'success': True,
+                'results': results,
+                'unchanged': True
+            })
+        run_blocking(processor.update_user_analytics_batch, updated_channels)
         
-        summary = processor.get_all_channels_summary()
+        invalidate_channel_data()
+        summary, _ = summary_cache.get()
         
-        # Emit update to all connected clients
-        socketio.emit('data_update', {'channels': summary}, broadcast=True)
+        # Emit update to all connected clients; the broadcaster coalesces bursts
+        broadcast_summary()
+        broadcast_channel_views(updated_channels)
         
         return jsonify({
             'success': True,
@@ -225,18 +859,20 @@ def manual_process():
 @socketio.on('connect')
 def handle_connect():
     """Handle client connection"""
-    print('Client connected')
+    logger.info('Client connected')
     # Send current data to newly connected client
     try:
-        summary = processor.get_all_channels_summary()
-        emit('data_update', {'channels': summary})
+        eio_sid = socketio.server.manager.eio_sid_from_sid(request.sid, '/')
+        send_packets(eio_sid, summary_cache.packets())
     except Exception as e:
-        print(f"Error sending initial data: {e}")
+        logger.error(f"Error sending initial data: {e}")
 
 @socketio.on('disconnect')
 def handle_disconnect():
     """Handle client disconnection"""
-    print('Client disconnected')
+    logger.info('Client disconnected')
+    _channel_views.pop(request.sid, None)
+    summary_broadcaster.discard(socketio.server.manager.eio_sid_from_sid(request.sid, '/'))
 
 @socketio.on('request_channel_data')
 def handle_channel_request(data):
@@ -249,150 +885,209 @@ def handle_channel_request(data):
             emit('error', {'message': 'Channel name required'})
             return
         
-        # Get channel data (similar to API endpoint)
-        if date_filter:
-            chat_counts = processor.db.get_user_chat_counts(channel_name, date_filter)
-            user_messages = processor.db.get_user_messages(channel_name, date_filter)
-            groups, alt_scores, similar_users = processor.group_users_by_stylometry(user_messages)
-            
-            user_stats = []
-            # Use DB helper to get timestamps safely
-            user_timestamps = processor.db.get_user_timestamps(channel_name, date_filter)
-            for username in chat_counts:
-                chat_count = chat_counts[username]
-                alt_likelihood = alt_scores.get(username, 0.0) * 100
-                similar_user_list = similar_users.get(username, [])
-                ts_list = user_timestamps.get(username, [])
-                last_msg = ts_list[-1] if ts_list else None
-                user_stats.append({
-                    'username': username,
-                    'chat_count': chat_count,
-                    'alt_likelihood': alt_likelihood,
-                    'similar_users': similar_user_list,
-                    'last_updated': last_msg
-                })
-            user_stats.sort(key=lambda x: x['chat_count'], reverse=True)
-            if ':' in date_filter:
-                start_date, end_date = date_filter.split(':')
-            else:
-                start_date = end_date = date_filter
-            channel_data = {
-                'channel': channel_name,
-                'user_stats': user_stats,
-                'start_date': start_date,
-                'end_date': end_date,
-                'unique_user_count': len(groups),
-                'total_users': len(user_stats),
-                'total_messages': sum(stat['chat_count'] for stat in user_stats),
-                'last_updated': datetime.now().isoformat()
-            }
-        else:
-            channel_data = processor.get_channel_summary(channel_name)
+        # Get channel data (shared with the API endpoint)
+        payload_json = channel_payload_json(channel_name, date_filter)
         
-        emit('channel_data', channel_data)
+        eio_sid = socketio.server.manager.eio_sid_from_sid(request.sid, '/')
+        send_packets(eio_sid, _encode_json_event('channel_data', payload_json))
+        # Later updates to this channel are pushed to the client's view room
+        watch_channel(request.sid, channel_name, date_filter)
         
     except Exception as e:
         emit('error', {'message': str(e)})
 
+@socketio.on('leave_channel_data')
+def handle_channel_leave():
+    """Stop pushing channel updates to a client that closed its channel view"""
+    unwatch_channel(request.sid)
+
 def run_initial_processing():
     """Run initial processing in background thread"""
     try:
-        print("🔄 Running initial processing in background...")
+        logger.info("🔄 Running initial processing in background...")
         
         # Process chat logs (this will only process new/changed files)
-        results = processor.process_all_channels()
+        results = run_blocking(processor.process_all_channels)
         total_new_messages = sum(messages for messages, files in results.values())
         
         if total_new_messages > 0:
-            print(f"📊 Processed {total_new_messages} new messages from logs")
+            logger.info(f"📊 Processed {total_new_messages} new messages from logs")
         else:
-            print("✅ No new messages to process")
+            logger.info("✅ No new messages to process")
         
-        # Only update analytics for channels that need it
-        channels = processor.db.get_channels()
+        # Only update analytics for channels that need it. Work from the channels
+        # just processed: new messages always need analytics, so only the others
+        # go through the (DB-backed) staleness check, and only once each
+        pending = []
+        for channel, (new_msg_count, _) in results.items():
+            if new_msg_count > 0 or processor.needs_analytics_update(channel, 0):
+                pending.append(channel)
+            else:
+                logger.info(f"✅ Analytics for {channel} are up to date, skipping...")
         analytics_needed = 0
+        patches = ChannelPatchBuffer()
         
-        for channel in channels:
-            new_msg_count = results.get(channel, (0, 0))[0]
-            if processor.needs_analytics_update(channel, new_msg_count):
-                print(f"📈 Updating analytics for {channel}...")
-                processor.update_user_analytics(channel)
-                analytics_needed += 1
-                
-                # Emit real-time updates as each channel is processed
-                try:
-                    summary = processor.get_all_channels_summary()
-                    socketio.emit('data_update', {'channels': summary}, broadcast=True)
-                    socketio.emit('processing_status', {
-                        'status': 'processing', 
-                        'message': f'Updated analytics for {channel}',
-                        'progress': f'{analytics_needed}/{len([c for c in channels if processor.needs_analytics_update(c, results.get(c, (0, 0))[0])])}'
-                    }, broadcast=True)
-                except Exception as emit_error:
-                    print(f"Warning: Could not emit update: {emit_error}")
-            else:
-                print(f"✅ Analytics for {channel} are up to date, skipping...")
+        for channel in pending:
+            logger.info(f"📈 Updating analytics for {channel}...")
+            run_blocking(processor.update_user_analytics, channel)
+            analytics_needed += 1
+            invalidate_channel_data()
+            
+            # Emit real-time updates as channels are processed; only the updated
+            # channel's row is sent, coalesced with any others in the flush window
+            try:
+                patches.add(channel, run_blocking(processor.get_channel_summary, channel))
+                broadcast_channel_views([channel])
+                broadcast_in_batches('processing_status', {
+                    'status': 'processing', 
+                    'message': f'Updated analytics for {channel}',
+                    'progress': f'{analytics_needed}/{len(pending)}'
+                })
+            except Exception as emit_error:
+                logger.warning(f"Warning: Could not emit update: {emit_error}")
+        
+        try:
+            patches.flush()
+        except Exception as emit_error:
+            logger.warning(f"Warning: Could not emit update: {emit_error}")
         
         if analytics_needed == 0:
-            print("🎉 All analytics are up to date!")
+            logger.info("🎉 All analytics are up to date!")
         else:
-            print(f"✅ Updated analytics for {analytics_needed} channels")
+            logger.info(f"✅ Updated analytics for {analytics_needed} channels")
         
-        print("🎯 Initial processing complete!")
+        logger.info("🎯 Initial processing complete!")
         
         # Final update after all processing is done
+        if total_new_messages > 0:
+            invalidate_channel_data()
         try:
-            summary = processor.get_all_channels_summary()
-            socketio.emit('data_update', {'channels': summary}, broadcast=True)
-            socketio.emit('processing_status', {
+            broadcast_summary()
+            broadcast_in_batches('processing_status', {
                 'status': 'complete',
                 'message': 'All processing complete!',
                 'progress': '100%'
-            }, broadcast=True)
+            })
         except Exception as emit_error:
-            print(f"Warning: Could not emit final update: {emit_error}")
+            logger.warning(f"Warning: Could not emit final update: {emit_error}")
         
     except Exception as e:
-        print(f"❌ Error during initial processing: {e}")
+        logger.error(f"❌ Error during initial processing: {e}")
         try:
-            socketio.emit('processing_status', {
+            broadcast_in_batches('processing_status', {
                 'status': 'error',
                 'message': f'Processing error: {str(e)}'
-            }, broadcast=True)
+            })
         except:
             pass
 
+# start_background_services runs once per process, whichever entry point calls it first
+_background_lock = threading.Lock()
+_background_observer = None
+_background_started = False
+
+def start_background_services():
+    """Start the log watcher, the processing scheduler and the initial processing pass.
+    
+    Called from the ``__main__`` block and from gunicorn's post_worker_init hook
+    (gunicorn.conf.py); later calls return the same observer without starting anything.
+    """
+    global _background_observer, _background_started
+    with _background_lock:
+        if _background_started:
+            return _background_observer
+        _background_started = True
+        
+        # Watch for log changes; keep interval polling as a fallback
+        observer = _background_observer = start_log_watcher()
+        poll_seconds = WATCHED_POLL_INTERVAL_SECONDS if observer else POLL_INTERVAL_SECONDS
+        
+        # Start the background scheduler; the interval backs off while channels are idle
+        poll_backoff.start(poll_seconds)
+        scheduler.add_job(
+            func=process_and_update,
+            trigger=IntervalTrigger(seconds=poll_seconds),
+            id='process_chats',
+            name='Process chat logs and update analytics',
+            replace_existing=True,
+            misfire_grace_time=10,
+            coalesce=True,
+            max_instances=1
+        )
+        scheduler.start()
+        
+        # Start initial processing in background thread
+        def delayed_processing():
+            """Start processing after server is up"""
+            time.sleep(2)  # Give server time to start
+            run_initial_processing()
+        
+        initial_thread = threading.Thread(target=delayed_processing, daemon=True)
+        initial_thread.start()
+        
+        # Shut down the scheduler when exiting the app
+        atexit.register(lambda: scheduler.shutdown())
+        if observer:
+            atexit.register(observer.stop)
+        return observer
+
 def find_available_port(start_port=5001, max_attempts=10):
     """Find an available port starting from start_port"""
     for port in range(start_port, start_port + max_attempts):
         try:
             with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+                # Probe the way eventlet.listen binds, so a port still in TIME_WAIT
+                # from the previous run counts as free; SO_REUSEPORT is left off
+                # so a port held by a running instance is never shared
+                if sys.platform[:3] != 'win':
+                    s.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
                 s.bind(('0.0.0.0', port))
                 return port
         except OSError:
             continue
     return None
 
-def cleanup_processes():
-    """Kill any existing Python processes using our port"""
+def cleanup_processes(port=5001):
+    """Stop any other process listening on our port"""
+    if psutil is None:
+        logger.warning("⚠️  psutil not installed - cannot clean up processes on the port")
+        return
     try:
-        if os.name == 'nt':  # Windows
-            os.system('taskkill /F /IM python.exe 2>nul')
-            os.system('netstat -ano | findstr :5001 | for /f "tokens=5" %a in (\'more\') do taskkill /PID %a /F 2>nul')
-        else:  # Unix/Linux
-            os.system('pkill -f "python.*app.py"')
-            os.system('lsof -ti:5001 | xargs kill -9 2>/dev/null')
-    except:
-        pass
+        pids = {
+            conn.pid for conn in psutil.net_connections(kind='tcp')
+            if conn.laddr and conn.laddr.port == port and conn.pid and conn.pid != os.getpid()
+        }
+    except psutil.Error as e:
+        logger.warning(f"⚠️  Could not list connections: {e}")
+        return
+    
+    procs = []
+    for pid in pids:
+        try:
+            proc = psutil.Process(pid)
+            proc.terminate()
+            procs.append(proc)
+        except psutil.Error:
+            pass
+    
+    # Give them a moment to exit cleanly, then kill whatever is left
+    _, alive = psutil.wait_procs(procs, timeout=2)
+    for proc in alive:
+        try:
+            proc.kill()
+        except psutil.Error:
+            pass
 
 if __name__ == '__main__':
-    print("🚀 Chat Analytics Dashboard")
-    print("=" * 50)
+    logger.info("🚀 Chat Analytics Dashboard")
+    logger.info("=" * 50)
     
     # Handle Ctrl+C gracefully
     def signal_handler(sig, frame):
-        print("\n🛑 Shutting down gracefully...")
+        logger.info("\n🛑 Shutting down gracefully...")
         scheduler.shutdown()
+        if observer:
+            observer.stop()
         sys.exit(0)
     
     signal.signal(signal.SIGINT, signal_handler)
@@ -406,76 +1101,56 @@ if __name__ == '__main__':
         has_existing_data = len(existing_channels) > 0
         
         if has_existing_data:
-            print(f"✅ Found existing data for {len(existing_channels)} channels")
-            print("🎯 Starting server immediately - existing data will be available!")
-            print("🔄 New data processing will happen in background...")
+            logger.info(f"✅ Found existing data for {len(existing_channels)} channels")
+            logger.info("🎯 Starting server immediately - existing data will be available!")
+            logger.info("🔄 New data processing will happen in background...")
         else:
-            print("📝 No existing data found - will process initial data in background")
-            print("⏳ Dashboard will load data as it's processed...")
+            logger.info("📝 No existing data found - will process initial data in background")
+            logger.info("⏳ Dashboard will load data as it's processed...")
             
     except Exception as e:
-        print(f"⚠️  Error checking existing data: {e}")
-        print("🔄 Will attempt processing in background...")
-    
-    # Start the background scheduler
-    scheduler.add_job(
-        func=process_and_update,
-        trigger=IntervalTrigger(seconds=60),  # Run every 60 seconds
-        id='process_chats',
-        name='Process chat logs and update analytics',
-        replace_existing=True
-    )
-    scheduler.start()
-    
-    # Start initial processing in background thread
-    def delayed_processing():
-        """Start processing after server is up"""
-        import time
-        time.sleep(2)  # Give server time to start
-        run_initial_processing()
-    
-    initial_thread = threading.Thread(target=delayed_processing, daemon=True)
-    initial_thread.start()
-    
-    # Shut down the scheduler when exiting the app
-    atexit.register(lambda: scheduler.shutdown())
+        logger.warning(f"⚠️  Error checking existing data: {e}")
+        logger.info("🔄 Will attempt processing in background...")
+    
+    # Log watching, scheduled processing and the initial pass
+    observer = start_background_services()
     
     # Find an available port
     port = find_available_port(5001)
     if port is None:
-        print("❌ Could not find available port. Cleaning up processes...")
+        logger.error("❌ Could not find available port. Cleaning up processes...")
         cleanup_processes()
         port = find_available_port(5001)
         if port is None:
-            print("❌ Still cannot find available port. Exiting...")
+            logger.error("❌ Still cannot find available port. Exiting...")
             sys.exit(1)
     
-    print(f"\n🌐 Starting Flask-SocketIO server...")
-    print(f"📍 Dashboard will be available at: http://localhost:{port}")
+    logger.info(f"\n🌐 Starting Flask-SocketIO server...")
+    logger.info(f"📍 Dashboard will be available at: http://localhost:{port}")
     
     if has_existing_data:
-        print("🎉 Dashboard accessible immediately with existing data!")
-        print("🔄 Background processing will update with any new data...")
+        logger.info("🎉 Dashboard accessible immediately with existing data!")
+        logger.info("🔄 Background processing will update with any new data...")
     else:
-        print("⏳ Dashboard will populate as data is processed in background...")
+        logger.info("⏳ Dashboard will populate as data is processed in background...")
     
-    print("\n" + "=" * 50)
+    logger.info("\n" + "=" * 50)
     
     # Run the Flask-SocketIO server
     try:
         socketio.run(app, debug=False, host='0.0.0.0', port=port)
     except OSError as e:
         if "Address already in use" in str(e) or "10048" in str(e):
-            print(f"❌ Port {port} is still in use. Trying to clean up...")
+            logger.error(f"❌ Port {port} is still in use. Trying to clean up...")
             cleanup_processes()
             import time
             time.sleep(2)
             port = find_available_port(5001)
             if port:
-                print(f"🔄 Retrying on port {port}...")
+                logger.info(f"🔄 Retrying on port {port}...")
                 socketio.run(app, debug=False, host='0.0.0.0', port=port)
             else:
-                print("❌ Could not start server. Please manually kill any running instances.")
+                logger.error("❌ Could not start server. Please manually kill any running instances.")
                 sys.exit(1)
         else:
             raise e
\ No newline at end of file
@@ -2,9 +2,12 @@ import sqlite3
 import json
 import threading
 import time
+import numpy as np
+from collections import deque, defaultdict
 from contextlib import contextmanager
+from itertools import chain
 from datetime import datetime
-from typing import Dict, List, Tuple, Optional
+from typing import Dict, Iterable, List, Tuple, Optional
 
 class DatabaseConnectionManager:
     """Thread-safe database connection manager with connection pooling and timeout handling"""
@@ -14,6 +17,23 @@ class DatabaseConnectionManager:
         self.timeout = timeout
         self._lock = threading.Lock()
     
+    def _configure(self, conn: sqlite3.Connection, timeout: float):
+        """Apply the pragmas shared by every read-write connection"""
+        # Enable WAL mode for better concurrency
+        conn.execute("PRAGMA journal_mode=WAL")
+        # In WAL mode NORMAL stays consistent after a crash and skips the fsync per commit
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        conn.execute("PRAGMA mmap_size=1073741824")  # 1 GB
+        conn.execute("PRAGMA cache_size=-131072")  # 128 MB
+        conn.execute("PRAGMA wal_autocheckpoint=1000")
+        
+        # Set busy timeout
+        conn.execute(f"PRAGMA busy_timeout={int(timeout * 1000)}")
+        
+        # Enable foreign keys
+        conn.execute("PRAGMA foreign_keys=ON")
+    
     @contextmanager
     def get_connection(self, timeout: Optional[float] = None):
         """Get a database connection with proper timeout and error handling"""
@@ -28,15 +48,7 @@ class DatabaseConnectionManager:
                 timeout=timeout,
                 check_same_thread=False
             )
-            
-            # Enable WAL mode for better concurrency
-            conn.execute("PRAGMA journal_mode=WAL")
-            
-            # Set busy timeout
-            conn.execute(f"PRAGMA busy_timeout={int(timeout * 1000)}")
-            
-            # Enable foreign keys
-            conn.execute("PRAGMA foreign_keys=ON")
+            self._configure(conn, timeout)
             
             yield conn
             
@@ -53,9 +65,7 @@ class DatabaseConnectionManager:
                         timeout=timeout,
                         check_same_thread=False
                     )
-                    conn.execute("PRAGMA journal_mode=WAL")
-                    conn.execute(f"PRAGMA busy_timeout={int(timeout * 1000)}")
-                    conn.execute("PRAGMA foreign_keys=ON")
+                    self._configure(conn, timeout)
                     yield conn
                 except Exception as retry_e:
                     print(f"Database retry failed: {retry_e}")
@@ -84,11 +94,80 @@ class DatabaseConnectionManager:
                 conn.rollback()
                 raise e
 
+class PooledConnection:
+    """Read connection handle whose close() hands the connection back to its pool"""
+    
+    def __init__(self, pool, conn):
+        self._pool = pool
+        self._conn = conn
+    
+    def close(self):
+        if self._conn is not None:
+            self._pool.release(self._conn)
+            self._conn = None
+    
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+class ReadConnectionPool:
+    """Pool of read-only SQLite connections reused across queries.
+    
+    WAL mode allows many concurrent readers alongside the writer, so reads skip the
+    open/close (and WAL/SHM mapping) cost of a fresh connection per query. Idle
+    connections are kept up to max_size; if all are busy an extra one is opened
+    rather than blocking the caller.
+    """
+    
+    def __init__(self, db_path: str, max_size: int = 8, timeout: float = 30.0):
+        self.db_path = db_path
+        self.max_size = max_size
+        self.timeout = timeout
+        self._idle = deque()
+    
+    def _open(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(
+            f"file:{self.db_path}?mode=ro",
+            uri=True,
+            timeout=self.timeout,
+            check_same_thread=False
+        )
+        conn.execute("PRAGMA query_only=1")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        # Reads are served from the memory map; the page cache stays small because
+        # every pooled connection keeps its own
+        conn.execute("PRAGMA mmap_size=1073741824")  # 1 GB
+        conn.execute("PRAGMA cache_size=-16384")  # 16 MB
+        return conn
+    
+    def connect(self) -> PooledConnection:
+        """Take a connection from the pool; close() on the handle returns it"""
+        try:
+            conn = self._idle.pop()
+        except IndexError:
+            conn = self._open()
+        return PooledConnection(self, conn)
+    
+    def release(self, conn: sqlite3.Connection):
+        if len(self._idle) < self.max_size:
+            self._idle.append(conn)
+        else:
+            conn.close()
+    
+    @contextmanager
+    def read(self):
+        """Borrow a read connection for the duration of a with-block"""
+        conn = self.connect()
+        try:
+            yield conn
+        finally:
+            conn.close()
+
 class ChatDatabase:
     def __init__(self, db_path="chat_data.db"):
         self.db_path = db_path
         self.db_manager = DatabaseConnectionManager(db_path, timeout=30.0)
         self.init_database()
+        self.read_pool = ReadConnectionPool(db_path, timeout=30.0)
     
     def init_database(self):
         """Initialize the database with required tables"""
@@ -116,6 +195,7 @@ class ChatDatabase:
                 filename TEXT NOT NULL,
                 file_path TEXT NOT NULL,
                 last_processed_line INTEGER DEFAULT 0,
+                last_byte_offset INTEGER,
                 file_size INTEGER DEFAULT 0,
                 last_modified DATETIME,
                 created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
@@ -124,6 +204,11 @@ class ChatDatabase:
             )
             ''')
             
+            # Databases created before logs were resumed by byte offset lack the column
+            columns = {row[1] for row in cursor.execute('PRAGMA table_info(processed_files)')}
+            if 'last_byte_offset' not in columns:
+                cursor.execute('ALTER TABLE processed_files ADD COLUMN last_byte_offset INTEGER')
+            
             # Table for storing user statistics
             cursor.execute('''
                 CREATE TABLE IF NOT EXISTS user_stats (
@@ -266,26 +351,29 @@ class ChatDatabase:
             # Create indexes for better performance
             cursor.execute('CREATE INDEX IF NOT EXISTS idx_chat_channel_date ON chat_messages(channel, log_date)')
             cursor.execute('CREATE INDEX IF NOT EXISTS idx_chat_username ON chat_messages(username)')
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_chat_channel_user_ts ON chat_messages(channel, username, timestamp, id)')
             cursor.execute('CREATE INDEX IF NOT EXISTS idx_user_stats_channel ON user_stats(channel)')
             cursor.execute('CREATE INDEX IF NOT EXISTS idx_user_words_channel_user ON user_words(channel, username)')
             cursor.execute('CREATE INDEX IF NOT EXISTS idx_user_words_word ON user_words(word)')
             cursor.execute('CREATE INDEX IF NOT EXISTS idx_words_dictionary_text ON words_dictionary(word_text)')
             cursor.execute('CREATE INDEX IF NOT EXISTS idx_user_word_frequencies_channel_user ON user_word_frequencies(channel, username)')
             cursor.execute('CREATE INDEX IF NOT EXISTS idx_user_word_frequencies_word_id ON user_word_frequencies(word_id)')
-            cursor.execute('CREATE INDEX IF NOT EXISTS idx_user_similarities_channel ON user_similarities(channel)')
-            cursor.execute('CREATE INDEX IF NOT EXISTS idx_user_similarities_users ON user_similarities(channel, user1, user2)')
+            # UNIQUE(channel, user1, user2) already indexes these columns (and channel alone as its
+            # prefix); separate copies only slow similarity writes
+            cursor.execute('DROP INDEX IF EXISTS idx_user_similarities_channel')
+            cursor.execute('DROP INDEX IF EXISTS idx_user_similarities_users')
             cursor.execute('CREATE INDEX IF NOT EXISTS idx_user_patterns_channel_user ON user_patterns(channel, username)')
             cursor.execute('CREATE INDEX IF NOT EXISTS idx_user_temporal_channel_user ON user_temporal_patterns(channel, username)')
             
             conn.commit()
     
-    def get_processed_file_info(self, channel: str, filename: str) -> Optional[Tuple[int, int, str]]:
-        """Get processing info for a file: (last_line, file_size, last_modified)"""
-        conn = sqlite3.connect(self.db_path)
+    def get_processed_file_info(self, channel: str, filename: str) -> Optional[Tuple[Optional[int], int, str, int]]:
+        """Get processing info for a file: (last_byte_offset, file_size, last_modified, last_line)"""
+        conn = self.read_pool.connect()
         cursor = conn.cursor()
         
         cursor.execute('''
-            SELECT last_processed_line, file_size, last_modified 
+            SELECT last_byte_offset, file_size, last_modified, last_processed_line 
             FROM processed_files 
             WHERE channel = ? AND filename = ?
         ''', (channel, filename))
@@ -294,21 +382,82 @@ class ChatDatabase:
         conn.close()
         return result
     
+    def get_processed_files(self, channel: str) -> Dict[str, Tuple[Optional[int], int, str, int]]:
+        """Get processing info for every file of a channel: {filename: (last_byte_offset, file_size, last_modified, last_line)}"""
+        conn = self.read_pool.connect()
+        cursor = conn.cursor()
+        
+        cursor.execute('''
+            SELECT filename, last_byte_offset, file_size, last_modified, last_processed_line 
+            FROM processed_files 
+            WHERE channel = ?
+        ''', (channel,))
+        
+        result = {row[0]: row[1:] for row in cursor.fetchall()}
+        conn.close()
+        return result
+    
     def update_processed_file_info(self, channel: str, filename: str, file_path: str, 
-                                 last_line: int, file_size: int, last_modified: str):
+                                 last_byte_offset: int, file_size: int, last_modified: str):
         """Update or insert file processing information"""
         with self.db_manager.transaction() as conn:
             cursor = conn.cursor()
             
             cursor.execute('''
                 INSERT OR REPLACE INTO processed_files 
-                (channel, filename, file_path, last_processed_line, file_size, last_modified, updated_at)
+                (channel, filename, file_path, last_byte_offset, file_size, last_modified, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+            ''', (channel, filename, file_path, last_byte_offset, file_size, last_modified))
+    
+    def save_log_tail(self, channel: str, filename: str, file_path: str, rows: Iterable[Tuple[str, str, str, str, str]],
+                      last_byte_offset: int, file_size: int, last_modified: str) -> int:
+        """Insert the new chat rows of a log file and record how far it was read, in one transaction.
+        rows may be any iterable (it is consumed lazily); returns the number of rows inserted"""
+        with self.db_manager.transaction() as conn:
+            cursor = conn.cursor()
+            
+            cursor.executemany('''
+                INSERT INTO chat_messages (channel, username, message, timestamp, log_date)
+                VALUES (?, ?, ?, ?, ?)
+            ''', rows)
+            inserted = max(cursor.rowcount, 0)
+            
+            cursor.execute('''
+                INSERT OR REPLACE INTO processed_files 
+                (channel, filename, file_path, last_byte_offset, file_size, last_modified, updated_at)
                 VALUES (?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
-            ''', (channel, filename, file_path, last_line, file_size, last_modified))
+            ''', (channel, filename, file_path, last_byte_offset, file_size, last_modified))
+        return inserted
+    
+    def save_log_tails(self, channel: str, tails: List[Tuple[str, str, List[Tuple[str, str, str, str, str]], int, int, str]]):
+        """Store several log tails, as (filename, file_path, rows, last_byte_offset, file_size, last_modified),
+        in one transaction"""
+        if not tails:
+            return
+        
+        with self.db_manager.transaction() as conn:
+            cursor = conn.cursor()
+            
+            cursor.executemany('''
+                INSERT INTO chat_messages (channel, username, message, timestamp, log_date)
+                VALUES (?, ?, ?, ?, ?)
+            ''', chain.from_iterable(tail[2] for tail in tails))
+            
+            cursor.executemany('''
+                INSERT OR REPLACE INTO processed_files 
+                (channel, filename, file_path, last_byte_offset, file_size, last_modified, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+            ''', [(channel, filename, file_path, last_byte_offset, file_size, last_modified)
+                  for filename, file_path, _, last_byte_offset, file_size, last_modified in tails])
     
     def insert_chat_messages(self, messages: List[Dict]):
         """Insert multiple chat messages"""
-        if not messages:
+        self.insert_chat_rows([(msg['channel'], msg['username'], msg['message'], 
+                                msg['timestamp'], msg['log_date']) for msg in messages])
+    
+    def insert_chat_rows(self, rows: List[Tuple[str, str, str, str, str]]):
+        """Insert chat messages given as (channel, username, message, timestamp, log_date) tuples"""
+        if not rows:
             return
             
         with self.db_manager.transaction() as conn:
@@ -317,12 +466,11 @@ class ChatDatabase:
             cursor.executemany('''
                 INSERT INTO chat_messages (channel, username, message, timestamp, log_date)
                 VALUES (?, ?, ?, ?, ?)
-            ''', [(msg['channel'], msg['username'], msg['message'], 
-                   msg['timestamp'], msg['log_date']) for msg in messages])
+            ''', rows)
     
     def get_user_chat_counts(self, channel: str, date_filter: Optional[str] = None) -> Dict[str, int]:
-        """Get chat counts for users in a channel with optional date filtering"""
-        conn = sqlite3.connect(self.db_path)
+        """Get chat counts for users in a channel with optional date filtering, ordered by count descending"""
+        conn = self.read_pool.connect()
         cursor = conn.cursor()
         
         if date_filter:
@@ -378,7 +526,7 @@ class ChatDatabase:
 
     def get_user_messages(self, channel: str, date_filter: Optional[str] = None) -> Dict[str, List[str]]:
         """Get all messages for users in a channel with optional date filtering"""
-        conn = sqlite3.connect(self.db_path)
+        conn = self.read_pool.connect()
         cursor = conn.cursor()
         
         if date_filter:
@@ -408,7 +556,7 @@ class ChatDatabase:
     
     def get_user_timestamps(self, channel: str, date_filter: Optional[str] = None) -> Dict[str, List[str]]:
         """Get all message timestamps for users in a channel with optional date filtering"""
-        conn = sqlite3.connect(self.db_path)
+        conn = self.read_pool.connect()
         cursor = conn.cursor()
         
         if date_filter:
@@ -436,6 +584,28 @@ class ChatDatabase:
         conn.close()
         return user_timestamps
     
+    def get_user_last_timestamps(self, channel: str, date_filter: Optional[str] = None) -> Dict[str, str]:
+        """Get each user's latest message timestamp in a channel with optional date filtering"""
+        conn = self.read_pool.connect()
+        cursor = conn.cursor()
+        
+        if date_filter:
+            query, params = self._build_date_filter_query(channel, date_filter)
+        else:
+            query, params = "channel = ?", (channel,)
+        
+        # One grouped query served from the (channel, username, timestamp, id) index
+        cursor.execute(f'''
+            SELECT username, MAX(timestamp)
+            FROM chat_messages 
+            WHERE {query}
+            GROUP BY username
+        ''', params)
+        
+        result = dict(cursor.fetchall())
+        conn.close()
+        return result
+    
     def update_user_stats(self, channel: str, username: str, chat_count: int, 
                          alt_likelihood: float, similar_users: List[str]):
         """Update user statistics"""
@@ -450,7 +620,7 @@ class ChatDatabase:
     
     def get_user_stats(self, channel: str) -> List[Dict]:
         """Get all user statistics for a channel"""
-        conn = sqlite3.connect(self.db_path)
+        conn = self.read_pool.connect()
         cursor = conn.cursor()
         
         cursor.execute('''
@@ -475,9 +645,47 @@ class ChatDatabase:
         conn.close()
         return results
     
+    def get_user_stat(self, channel: str, username: str) -> Optional[Dict]:
+        """Get statistics for a single user in a channel"""
+        conn = self.read_pool.connect()
+        cursor = conn.cursor()
+        
+        # Served by the UNIQUE(channel, username) index
+        cursor.execute('''
+            SELECT username, chat_count, alt_likelihood, similar_users, last_updated
+            FROM user_stats
+            WHERE channel = ? AND username = ?
+            LIMIT 1
+        ''', (channel, username))
+        
+        row = cursor.fetchone()
+        conn.close()
+        
+        if not row:
+            return None
+        username, chat_count, alt_likelihood, similar_users_json, last_updated = row
+        return {
+            'username': username,
+            'chat_count': chat_count,
+            'alt_likelihood': alt_likelihood,
+            'similar_users': json.loads(similar_users_json) if similar_users_json else [],
+            'last_updated': last_updated
+        }
+    
+    def has_user_stats(self, channel: str) -> bool:
+        """Whether any user statistics are stored for a channel"""
+        conn = self.read_pool.connect()
+        cursor = conn.cursor()
+        
+        cursor.execute('SELECT 1 FROM user_stats WHERE channel = ? LIMIT 1', (channel,))
+        
+        row = cursor.fetchone()
+        conn.close()
+        return row is not None
+    
     def get_date_range(self, channel: str) -> Tuple[str, str]:
         """Get the date range of data for a channel"""
-        conn = sqlite3.connect(self.db_path)
+        conn = self.read_pool.connect()
         cursor = conn.cursor()
         
         cursor.execute('''
@@ -493,9 +701,34 @@ class ChatDatabase:
             return result[0], result[1]
         return "Unknown", "Unknown"
     
+    def get_channel_overview(self, channel: str) -> Dict:
+        """Get a channel's date range, unique user group count and total chat count in one query"""
+        conn = self.read_pool.connect()
+        cursor = conn.cursor()
+        
+        cursor.execute('''
+            SELECT
+                (SELECT MIN(log_date) FROM chat_messages WHERE channel = ?),
+                (SELECT MAX(log_date) FROM chat_messages WHERE channel = ?),
+                (SELECT COUNT(*) FROM stylometry_groups WHERE channel = ?),
+                (SELECT COALESCE(SUM(chat_count), 0) FROM user_stats WHERE channel = ?)
+        ''', (channel, channel, channel, channel))
+        
+        start_date, end_date, unique_user_count, total_messages = cursor.fetchone()
+        conn.close()
+        
+        if not (start_date and end_date):
+            start_date, end_date = "Unknown", "Unknown"
+        return {
+            'start_date': start_date,
+            'end_date': end_date,
+            'unique_user_count': unique_user_count,
+            'total_messages': total_messages
+        }
+    
     def get_channels(self) -> List[str]:
         """Get list of all channels with data"""
-        conn = sqlite3.connect(self.db_path)
+        conn = self.read_pool.connect()
         cursor = conn.cursor()
         
         cursor.execute('SELECT DISTINCT channel FROM chat_messages ORDER BY channel')
@@ -506,25 +739,21 @@ class ChatDatabase:
     
     def update_stylometry_groups(self, channel: str, groups: List[List[str]]):
         """Update stylometry groups for a channel"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        # Clear existing groups for this channel
-        cursor.execute('DELETE FROM stylometry_groups WHERE channel = ?', (channel,))
-        
-        # Insert new groups
-        for group_id, group in enumerate(groups):
-            cursor.execute('''
+        with self.db_manager.transaction() as conn:
+            cursor = conn.cursor()
+            
+            # Clear existing groups for this channel
+            cursor.execute('DELETE FROM stylometry_groups WHERE channel = ?', (channel,))
+            
+            # Insert new groups
+            cursor.executemany('''
                 INSERT INTO stylometry_groups (channel, group_id, usernames)
                 VALUES (?, ?, ?)
-            ''', (channel, group_id, json.dumps(group)))
-        
-        conn.commit()
-        conn.close()
+            ''', [(channel, group_id, json.dumps(group)) for group_id, group in enumerate(groups)])
     
     def get_unique_user_count(self, channel: str) -> int:
         """Get the number of unique user groups (estimated actual users)"""
-        conn = sqlite3.connect(self.db_path)
+        conn = self.read_pool.connect()
         cursor = conn.cursor()
         
         cursor.execute('SELECT COUNT(*) FROM stylometry_groups WHERE channel = ?', (channel,))
@@ -535,7 +764,7 @@ class ChatDatabase:
     
     def get_available_dates(self, channel: str) -> List[str]:
         """Get list of all available dates for a channel"""
-        conn = sqlite3.connect(self.db_path)
+        conn = self.read_pool.connect()
         cursor = conn.cursor()
         
         cursor.execute('''
@@ -551,7 +780,7 @@ class ChatDatabase:
     
     def get_analytics_status(self, channel: str) -> Optional[Dict]:
         """Get analytics processing status for a channel"""
-        conn = sqlite3.connect(self.db_path)
+        conn = self.read_pool.connect()
         cursor = conn.cursor()
         
         cursor.execute('''
@@ -574,24 +803,58 @@ class ChatDatabase:
     
     def update_analytics_status(self, channel: str, last_processed_date: str, total_messages: int):
         """Update analytics processing status for a channel"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            INSERT OR REPLACE INTO analytics_status 
-            (channel, last_processed_date, total_messages, last_analytics_update, analytics_version)
-            VALUES (?, ?, ?, CURRENT_TIMESTAMP, 1)
-        ''', (channel, last_processed_date, total_messages))
-        
-        conn.commit()
-        conn.close()
+        with self.db_manager.transaction() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute('''
+                INSERT OR REPLACE INTO analytics_status 
+                (channel, last_processed_date, total_messages, last_analytics_update, analytics_version)
+                VALUES (?, ?, ?, CURRENT_TIMESTAMP, 1)
+            ''', (channel, last_processed_date, total_messages))
     
-    def get_total_messages_count(self, channel: str) -> int:
-        """Get total number of messages for a channel"""
-        conn = sqlite3.connect(self.db_path)
+    def save_channel_analytics(self, analytics: List[Dict]):
+        """Store stylometry groups, user stats and analytics status for one or more
+        channels in a single transaction"""
+        with self.db_manager.transaction() as conn:
+            cursor = conn.cursor()
+            
+            for channel_analytics in analytics:
+                channel = channel_analytics['channel']
+                
+                # Replace the stylometry groups for this channel
+                cursor.execute('DELETE FROM stylometry_groups WHERE channel = ?', (channel,))
+                cursor.executemany('''
+                    INSERT INTO stylometry_groups (channel, group_id, usernames)
+                    VALUES (?, ?, ?)
+                ''', [(channel, group_id, json.dumps(group))
+                      for group_id, group in enumerate(channel_analytics['groups'])])
+                
+                cursor.executemany('''
+                    INSERT OR REPLACE INTO user_stats 
+                    (channel, username, chat_count, alt_likelihood, similar_users, last_updated)
+                    VALUES (?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+                ''', [(channel, username, chat_count, alt_likelihood, json.dumps(similar_users))
+                      for username, chat_count, alt_likelihood, similar_users in channel_analytics['user_stats']])
+                
+                if channel_analytics.get('status'):
+                    last_processed_date, total_messages = channel_analytics['status']
+                    cursor.execute('''
+                        INSERT OR REPLACE INTO analytics_status 
+                        (channel, last_processed_date, total_messages, last_analytics_update, analytics_version)
+                        VALUES (?, ?, ?, CURRENT_TIMESTAMP, 1)
+                    ''', (channel, last_processed_date, total_messages))
+    
+    def get_total_messages_count(self, channel: str, date_filter: Optional[str] = None) -> int:
+        """Get total number of messages for a channel with optional date filtering"""
+        conn = self.read_pool.connect()
         cursor = conn.cursor()
         
-        cursor.execute('SELECT COUNT(*) FROM chat_messages WHERE channel = ?', (channel,))
+        if date_filter:
+            query, params = self._build_date_filter_query(channel, date_filter)
+        else:
+            query, params = "channel = ?", (channel,)
+        
+        cursor.execute(f'SELECT COUNT(*) FROM chat_messages WHERE {query}', params)
         result = cursor.fetchone()
         
         conn.close()
@@ -599,84 +862,104 @@ class ChatDatabase:
     
     def update_user_words_optimized(self, channel: str, username: str, words: Dict[str, int]):
         """Optimized word storage using normalized tables"""
-        if not words:
+        self.bulk_update_user_words(channel, {username: words})
+    
+    def bulk_update_user_words(self, channel: str, user_words: Dict[str, Dict[str, int]]):
+        """Store word frequencies for many users of a channel in one transaction"""
+        user_words = {username: words for username, words in user_words.items() if words}
+        if not user_words:
             return
-            
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        # Get existing word frequencies for this user
-        cursor.execute('''
-            SELECT wd.word_text, uwf.frequency, uwf.word_id
-            FROM user_word_frequencies uwf
-            JOIN words_dictionary wd ON uwf.word_id = wd.word_id
-            WHERE uwf.channel = ? AND uwf.username = ?
-        ''', (channel, username))
-        
-        existing_words = {word_text: {'frequency': freq, 'word_id': word_id} 
-                         for word_text, freq, word_id in cursor.fetchall()}
-        
-        # Process each word
-        words_to_insert = []
-        words_to_update = []
         
-        for word_text, new_frequency in words.items():
-            # Get or create word in dictionary
-            word_id = self._get_or_create_word_id(cursor, word_text)
+        with self.db_manager.transaction() as conn:
+            cursor = conn.cursor()
             
-            if word_text in existing_words:
-                # Update existing frequency if changed
-                if existing_words[word_text]['frequency'] != new_frequency:
-                    words_to_update.append((new_frequency, channel, username, word_id))
-            else:
-                # New word for this user
-                words_to_insert.append((channel, username, word_id, new_frequency))
-        
-        # Remove words that are no longer used
-        current_word_texts = set(words.keys())
-        words_to_remove = [existing_words[word_text]['word_id'] 
-                          for word_text in existing_words 
-                          if word_text not in current_word_texts]
-        
-        # Execute batch operations
-        if words_to_insert:
-            cursor.executemany('''
-                INSERT INTO user_word_frequencies (channel, username, word_id, frequency, last_updated)
-                VALUES (?, ?, ?, ?, CURRENT_TIMESTAMP)
-            ''', words_to_insert)
-        
-        if words_to_update:
-            cursor.executemany('''
-                UPDATE user_word_frequencies 
-                SET frequency = ?, last_updated = CURRENT_TIMESTAMP
-                WHERE channel = ? AND username = ? AND word_id = ?
-            ''', words_to_update)
-        
-        if words_to_remove:
-            cursor.executemany('''
-                DELETE FROM user_word_frequencies 
-                WHERE channel = ? AND username = ? AND word_id = ?
-            ''', [(channel, username, word_id) for word_id in words_to_remove])
-        
-        conn.commit()
-        conn.close()
+            # Get existing word frequencies for these users
+            cursor.execute('''
+                SELECT uwf.username, wd.word_text, uwf.frequency, uwf.word_id
+                FROM user_word_frequencies uwf
+                JOIN words_dictionary wd ON uwf.word_id = wd.word_id
+                WHERE uwf.channel = ?
+            ''', (channel,))
+            
+            existing = defaultdict(dict)
+            for username, word_text, frequency, word_id in cursor.fetchall():
+                if username in user_words:
+                    existing[username][word_text] = (frequency, word_id)
+            
+            # Dictionary ids for every word, creating missing ones in first-seen order
+            word_ids = self._get_or_create_word_ids(
+                cursor, list(dict.fromkeys(w for words in user_words.values() for w in words))
+            )
+            
+            words_to_insert = []
+            words_to_update = []
+            words_to_remove = []
+            
+            for username, words in user_words.items():
+                existing_words = existing.get(username, {})
+                
+                for word_text, new_frequency in words.items():
+                    if word_text in existing_words:
+                        # Update existing frequency if changed
+                        if existing_words[word_text][0] != new_frequency:
+                            words_to_update.append((new_frequency, channel, username, word_ids[word_text]))
+                    else:
+                        # New word for this user
+                        words_to_insert.append((channel, username, word_ids[word_text], new_frequency))
+                
+                # Remove words that are no longer used
+                words_to_remove.extend((channel, username, word_id)
+                                       for word_text, (_, word_id) in existing_words.items()
+                                       if word_text not in words)
+            
+            if words_to_insert:
+                cursor.executemany('''
+                    INSERT INTO user_word_frequencies (channel, username, word_id, frequency, last_updated)
+                    VALUES (?, ?, ?, ?, CURRENT_TIMESTAMP)
+                ''', words_to_insert)
+            
+            if words_to_update:
+                cursor.executemany('''
+                    UPDATE user_word_frequencies 
+                    SET frequency = ?, last_updated = CURRENT_TIMESTAMP
+                    WHERE channel = ? AND username = ? AND word_id = ?
+                ''', words_to_update)
+            
+            if words_to_remove:
+                cursor.executemany('''
+                    DELETE FROM user_word_frequencies 
+                    WHERE channel = ? AND username = ? AND word_id = ?
+                ''', words_to_remove)
     
     def _get_or_create_word_id(self, cursor, word_text: str) -> int:
         """Get existing word_id or create new word in dictionary"""
-        # Try to get existing word
-        cursor.execute('SELECT word_id FROM words_dictionary WHERE word_text = ?', (word_text,))
-        result = cursor.fetchone()
-        
-        if result:
-            return result[0]
+        return self._get_or_create_word_ids(cursor, [word_text])[word_text]
+    
+    def _get_or_create_word_ids(self, cursor, word_texts: List[str]) -> Dict[str, int]:
+        """Get word_ids for many words, creating the missing ones in the given order"""
+        word_ids = self._lookup_word_ids(cursor, word_texts)
         
-        # Create new word
-        cursor.execute('''
-            INSERT INTO words_dictionary (word_text, created_at)
-            VALUES (?, CURRENT_TIMESTAMP)
-        ''', (word_text,))
+        missing = [word_text for word_text in word_texts if word_text not in word_ids]
+        if missing:
+            cursor.executemany('''
+                INSERT INTO words_dictionary (word_text, created_at)
+                VALUES (?, CURRENT_TIMESTAMP)
+            ''', [(word_text,) for word_text in missing])
+            word_ids.update(self._lookup_word_ids(cursor, missing))
         
-        return cursor.lastrowid
+        return word_ids
+    
+    def _lookup_word_ids(self, cursor, word_texts: List[str]) -> Dict[str, int]:
+        """Existing word_ids for the given words, queried in chunks below SQLite's variable limit"""
+        word_ids = {}
+        for start in range(0, len(word_texts), 500):
+            chunk = word_texts[start:start + 500]
+            cursor.execute(
+                f'SELECT word_text, word_id FROM words_dictionary WHERE word_text IN ({",".join("?" * len(chunk))})',
+                chunk
+            )
+            word_ids.update(cursor.fetchall())
+        return word_ids
     
     def update_user_words(self, channel: str, username: str, words: Dict[str, int]):
         """Legacy method - redirects to optimized version"""
@@ -684,7 +967,7 @@ class ChatDatabase:
     
     def get_user_words(self, channel: str, username: str) -> Dict[str, int]:
         """Get word frequencies for a user (optimized version)"""
-        conn = sqlite3.connect(self.db_path)
+        conn = self.read_pool.connect()
         cursor = conn.cursor()
         
         # Try optimized table first
@@ -710,7 +993,7 @@ class ChatDatabase:
     
     def get_all_user_words(self, channel: str) -> Dict[str, Dict[str, int]]:
         """Get word frequencies for all users in a channel (optimized version)"""
-        conn = sqlite3.connect(self.db_path)
+        conn = self.read_pool.connect()
         cursor = conn.cursor()
         
         # Try optimized tables first
@@ -746,7 +1029,7 @@ class ChatDatabase:
     
     def get_word_statistics(self, channel: str) -> Dict:
         """Get statistics about word storage efficiency"""
-        conn = sqlite3.connect(self.db_path)
+        conn = self.read_pool.connect()
         cursor = conn.cursor()
         
         # Count unique words in dictionary
@@ -779,70 +1062,92 @@ class ChatDatabase:
                              word_sim: float, pattern_sim: float, temporal_sim: float, behavioral_sim: float,
                              combined_sim: float, confidence: float, common_words: int, total_compared_words: int):
         """Update comprehensive similarity scores between two users"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        # Ensure consistent ordering (user1 <= user2 alphabetically)
-        if user1 > user2:
-            user1, user2 = user2, user1
+        self.bulk_update_user_similarity(channel, [(user1, user2, word_sim, pattern_sim, temporal_sim, behavioral_sim,
+                                                    combined_sim, confidence, common_words, total_compared_words)])
+    
+    def bulk_update_user_similarity(self, channel: str, rows: List[Tuple]):
+        """Store many update_user_similarity rows in one transaction:
+        (user1, user2, word_sim, pattern_sim, temporal_sim, behavioral_sim, combined_sim, confidence, common_words, total_compared_words)"""
+        if not rows:
+            return
         
-        cursor.execute('''
-            INSERT OR REPLACE INTO user_similarities 
-            (channel, user1, user2, word_similarity, pattern_similarity, temporal_similarity, 
-             behavioral_similarity, combined_similarity, confidence_score, common_words, 
-             total_compared_words, last_updated)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
-        ''', (channel, user1, user2, word_sim, pattern_sim, temporal_sim, behavioral_sim,
-              combined_sim, confidence, common_words, total_compared_words))
-        
-        conn.commit()
-        conn.close()
+        with self.db_manager.transaction() as conn:
+            cursor = conn.cursor()
+            # Pairs seen before are updated in place rather than deleted and re-inserted, and the
+            # rows are streamed to SQLite instead of being copied into a second list
+            cursor.executemany('''
+                INSERT INTO user_similarities 
+                (channel, user1, user2, word_similarity, pattern_similarity, temporal_similarity, 
+                 behavioral_similarity, combined_similarity, confidence_score, common_words, 
+                 total_compared_words, last_updated)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+                ON CONFLICT(channel, user1, user2) DO UPDATE SET
+                    word_similarity = excluded.word_similarity,
+                    pattern_similarity = excluded.pattern_similarity,
+                    temporal_similarity = excluded.temporal_similarity,
+                    behavioral_similarity = excluded.behavioral_similarity,
+                    combined_similarity = excluded.combined_similarity,
+                    confidence_score = excluded.confidence_score,
+                    common_words = excluded.common_words,
+                    total_compared_words = excluded.total_compared_words,
+                    last_updated = excluded.last_updated
+            ''', ((channel, *sorted((user1, user2)), *scores) for user1, user2, *scores in rows))
     
     def update_user_patterns(self, channel: str, username: str, patterns: Dict):
         """Store detailed user writing patterns"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        self.bulk_update_user_patterns(channel, {username: patterns})
+    
+    def bulk_update_user_patterns(self, channel: str, user_patterns: Dict[str, Dict]):
+        """Store writing patterns for many users of a channel in one transaction"""
+        if not user_patterns:
+            return
         
-        cursor.execute('''
-            INSERT OR REPLACE INTO user_patterns 
-            (channel, username, avg_message_length, message_length_variance, punctuation_ratio,
-             exclamation_ratio, question_ratio, caps_ratio, all_caps_frequency, emoji_frequency,
-             unique_emoji_count, repeated_char_frequency, typo_frequency, avg_words_per_message,
-             question_frequency, exclamation_frequency, statement_frequency, last_updated)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
-        ''', (channel, username, patterns.get('avg_message_length', 0),
-              patterns.get('message_length_variance', 0), patterns.get('punctuation_ratio', 0),
-              patterns.get('exclamation_ratio', 0), patterns.get('question_ratio', 0),
-              patterns.get('caps_ratio', 0), patterns.get('all_caps_frequency', 0),
-              patterns.get('emoji_frequency', 0), patterns.get('unique_emoji_count', 0),
-              patterns.get('repeated_char_frequency', 0), patterns.get('typo_frequency', 0),
-              patterns.get('avg_words_per_message', 0), patterns.get('question_frequency', 0),
-              patterns.get('exclamation_frequency', 0), patterns.get('statement_frequency', 0)))
-        
-        conn.commit()
-        conn.close()
+        with self.db_manager.transaction() as conn:
+            cursor = conn.cursor()
+            
+            cursor.executemany('''
+                INSERT OR REPLACE INTO user_patterns 
+                (channel, username, avg_message_length, message_length_variance, punctuation_ratio,
+                 exclamation_ratio, question_ratio, caps_ratio, all_caps_frequency, emoji_frequency,
+                 unique_emoji_count, repeated_char_frequency, typo_frequency, avg_words_per_message,
+                 question_frequency, exclamation_frequency, statement_frequency, last_updated)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+            ''', [(channel, username, patterns.get('avg_message_length', 0),
+                   patterns.get('message_length_variance', 0), patterns.get('punctuation_ratio', 0),
+                   patterns.get('exclamation_ratio', 0), patterns.get('question_ratio', 0),
+                   patterns.get('caps_ratio', 0), patterns.get('all_caps_frequency', 0),
+                   patterns.get('emoji_frequency', 0), patterns.get('unique_emoji_count', 0),
+                   patterns.get('repeated_char_frequency', 0), patterns.get('typo_frequency', 0),
+                   patterns.get('avg_words_per_message', 0), patterns.get('question_frequency', 0),
+                   patterns.get('exclamation_frequency', 0), patterns.get('statement_frequency', 0))
+                  for username, patterns in user_patterns.items()])
     
     def update_user_temporal_patterns(self, channel: str, username: str, temporal_data: Dict):
         """Store user temporal activity patterns"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        self.bulk_update_user_temporal_patterns(channel, {username: temporal_data})
+    
+    def bulk_update_user_temporal_patterns(self, channel: str, user_temporal: Dict[str, Dict]):
+        """Store temporal activity patterns for many users of a channel in one transaction"""
+        if not user_temporal:
+            return
         
-        cursor.execute('''
-            INSERT OR REPLACE INTO user_temporal_patterns 
-            (channel, username, peak_hours, avg_session_duration, avg_message_interval,
-             burst_frequency, timezone_consistency, activity_variance, total_sessions, last_updated)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
-        ''', (channel, username, json.dumps(temporal_data.get('peak_hours', [])),
-              temporal_data.get('avg_session_duration', 0), temporal_data.get('avg_message_interval', 0),
-              temporal_data.get('burst_frequency', 0), temporal_data.get('timezone_consistency', 0),
-              temporal_data.get('activity_variance', 0), temporal_data.get('total_sessions', 0)))
-        
-        conn.commit()
-        conn.close()
+        with self.db_manager.transaction() as conn:
+            cursor = conn.cursor()
+            
+            cursor.executemany('''
+                INSERT OR REPLACE INTO user_temporal_patterns 
+                (channel, username, peak_hours, avg_session_duration, avg_message_interval,
+                 burst_frequency, timezone_consistency, activity_variance, total_sessions, last_updated)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+            ''', [(channel, username, json.dumps(temporal_data.get('peak_hours', [])),
+                   temporal_data.get('avg_session_duration', 0), temporal_data.get('avg_message_interval', 0),
+                   temporal_data.get('burst_frequency', 0), temporal_data.get('timezone_consistency', 0),
+                   temporal_data.get('activity_variance', 0), temporal_data.get('total_sessions', 0))
+                  for username, temporal_data in user_temporal.items()])
     
     def get_user_patterns(self, channel: str, username: str = None) -> Dict:
         """Get user writing patterns"""
-        conn = sqlite3.connect(self.db_path)
+        conn = self.read_pool.connect()
         cursor = conn.cursor()
         
         if username:
@@ -871,7 +1176,7 @@ class ChatDatabase:
     
     def get_user_temporal_patterns(self, channel: str, username: str = None) -> Dict:
         """Get user temporal patterns"""
-        conn = sqlite3.connect(self.db_path)
+        conn = self.read_pool.connect()
         cursor = conn.cursor()
         
         if username:
@@ -905,7 +1210,7 @@ class ChatDatabase:
     
     def get_user_similarities(self, channel: str, username: str) -> List[Dict]:
         """Get similarity scores for a user compared to all other users"""
-        conn = sqlite3.connect(self.db_path)
+        conn = self.read_pool.connect()
         cursor = conn.cursor()
         
         cursor.execute('''
@@ -930,7 +1235,7 @@ class ChatDatabase:
     
     def get_top_user_similarities(self, channel: str) -> Dict[str, List[Dict]]:
         """Get top 5 most similar users for each user in the channel"""
-        conn = sqlite3.connect(self.db_path)
+        conn = self.read_pool.connect()
         cursor = conn.cursor()
         
         cursor.execute('''
@@ -968,13 +1273,17 @@ class ChatDatabase:
         return user_similarities
     
     def get_user_messages_paginated(self, channel: str, username: str, date_filter: Optional[str] = None, 
-                                   page: int = 1, limit: int = 100) -> List[Dict]:
-        """Get paginated messages for a specific user with timestamps"""
-        conn = sqlite3.connect(self.db_path)
+                                   page: int = 1, limit: int = 100,
+                                   after: Optional[Tuple[str, int]] = None) -> List[Dict]:
+        """Get paginated messages for a specific user with timestamps
+        
+        Pages are addressed by keyset: ``after`` is the (timestamp, id) of the last
+        message on the previous page, so deep pages don't scan and discard earlier
+        rows. ``page`` is only used (as an OFFSET) when no keyset is given.
+        """
+        conn = self.read_pool.connect()
         cursor = conn.cursor()
         
-        offset = (page - 1) * limit
-        
         # Build query with date filtering
         if date_filter:
             query, params = self._build_date_filter_query(channel, date_filter)
@@ -985,17 +1294,26 @@ class ChatDatabase:
             query = "channel = ? AND username = ?"
             params = (channel, username)
         
+        if after is not None:
+            after_timestamp, after_id = after
+            query += " AND (timestamp < ? OR (timestamp = ? AND id < ?))"
+            params += (after_timestamp, after_timestamp, after_id)
+            offset = 0
+        else:
+            offset = (page - 1) * limit
+        
         cursor.execute(f'''
-            SELECT message, timestamp, log_date
+            SELECT id, message, timestamp, log_date
             FROM chat_messages 
             WHERE {query}
-            ORDER BY timestamp DESC
+            ORDER BY timestamp DESC, id DESC
             LIMIT ? OFFSET ?
         ''', params + (limit, offset))
         
         messages = []
-        for message, timestamp, log_date in cursor.fetchall():
+        for message_id, message, timestamp, log_date in cursor.fetchall():
             messages.append({
+                'id': message_id,
                 'message': message,
                 'timestamp': timestamp,
                 'log_date': log_date
@@ -1006,7 +1324,7 @@ class ChatDatabase:
     
     def get_user_channels(self, username: str) -> List[Dict]:
         """Get all channels where a user has been active"""
-        conn = sqlite3.connect(self.db_path)
+        conn = self.read_pool.connect()
         cursor = conn.cursor()
         
         cursor.execute('''
@@ -1036,7 +1354,7 @@ class ChatDatabase:
     def get_user_activity_timeline(self, channel: str, username: str, 
                                  date_filter: Optional[str] = None) -> List[Dict]:
         """Get user's daily activity timeline"""
-        conn = sqlite3.connect(self.db_path)
+        conn = self.read_pool.connect()
         cursor = conn.cursor()
         
         # Build query with date filtering
@@ -1077,7 +1395,7 @@ class ChatDatabase:
     def get_user_temporal_analysis(self, channel: str, username: str, 
                                  date_filter: Optional[str] = None) -> Dict:
         """Get detailed temporal analysis for a user"""
-        conn = sqlite3.connect(self.db_path)
+        conn = self.read_pool.connect()
         cursor = conn.cursor()
         
         # Build query with date filtering
@@ -1182,7 +1500,7 @@ class ChatDatabase:
     def get_user_behavioral_insights(self, channel: str, username: str, 
                                    date_filter: Optional[str] = None) -> List[Dict]:
         """Generate behavioral insights for a user"""
-        conn = sqlite3.connect(self.db_path)
+        conn = self.read_pool.connect()
         cursor = conn.cursor()
         
         # Build query with date filtering
@@ -1308,7 +1626,7 @@ class ChatDatabase:
     def get_user_temporal_analysis(self, channel: str, username: str, 
                                  date_filter: Optional[str] = None) -> Dict:
         """Get detailed temporal analysis for a user"""
-        conn = sqlite3.connect(self.db_path)
+        conn = self.read_pool.connect()
         cursor = conn.cursor()
         
         # Build query with date filtering
@@ -1418,7 +1736,7 @@ class ChatDatabase:
     def get_user_behavioral_insights(self, channel: str, username: str, 
                                    date_filter: Optional[str] = None) -> Dict:
         """Get behavioral insights and patterns for a user"""
-        conn = sqlite3.connect(self.db_path)
+        conn = self.read_pool.connect()
         cursor = conn.cursor()
         
         # Build query with date filtering
@@ -1453,11 +1771,12 @@ class ChatDatabase:
         
         # Analyze message frequency patterns
         messages = [msg[0] for msg in messages_data]
-        timestamps = [datetime.fromisoformat(ts[1]) for ts in messages_data]
+        # Timestamps as seconds, parsed in one numpy pass (rows are already in time order)
+        seconds = np.array([msg[1] for msg in messages_data], dtype='datetime64[s]').astype(np.int64)
         
         # Calculate time-based frequencies
-        if len(timestamps) > 1:
-            total_time_span = (timestamps[-1] - timestamps[0]).total_seconds()
+        if len(seconds) > 1:
+            total_time_span = float(seconds[-1] - seconds[0])
             total_minutes = max(total_time_span / 60, 1)
             total_hours = max(total_time_span / 3600, 1)
             total_days = max(total_time_span / (3600 * 24), 1)
@@ -1494,30 +1813,21 @@ class ChatDatabase:
         
         # Analyze burst messaging (multiple messages in short time)
         burst_threshold = 60  # seconds
-        burst_count = 0
-        for i in range(1, len(timestamps)):
-            if (timestamps[i] - timestamps[i-1]).total_seconds() < burst_threshold:
-                burst_count += 1
-        
-        burst_messaging = burst_count > len(timestamps) * 0.3  # More than 30% are bursts
+        burst_count = int((np.diff(seconds) < burst_threshold).sum())
         
-        # Find peak activity times (group by hour)
-        hourly_activity = {}
-        for ts in timestamps:
-            hour = ts.hour
-            hourly_activity[hour] = hourly_activity.get(hour, 0) + 1
+        burst_messaging = burst_count > len(seconds) * 0.3  # More than 30% are bursts
         
-        peak_hours = sorted(hourly_activity.items(), key=lambda x: x[1], reverse=True)[:3]
+        # Find peak activity times (group by hour): most active first, ties by earliest message
+        hours = seconds // 3600 % 24
+        active_hours, first_seen, hour_counts = np.unique(hours, return_index=True, return_counts=True)
+        order = np.lexsort((first_seen, -hour_counts))[:3]
+        peak_hours = list(zip(active_hours[order].tolist(), hour_counts[order].tolist()))
         peak_activity_times = [f"{hour:02d}:00" for hour, count in peak_hours]
         
-        # Calculate activity consistency
-        daily_counts = {}
-        for ts in timestamps:
-            date_key = ts.date().isoformat()
-            daily_counts[date_key] = daily_counts.get(date_key, 0) + 1
+        # Calculate activity consistency from the message count of each day, in date order
+        daily_values = np.unique(seconds // 86400, return_counts=True)[1].tolist()
         
-        if len(daily_counts) > 1:
-            daily_values = list(daily_counts.values())
+        if len(daily_values) > 1:
             avg_daily = sum(daily_values) / len(daily_values)
             variance = sum((x - avg_daily) ** 2 for x in daily_values) / len(daily_values)
             consistency = 1.0 / (1.0 + variance / avg_daily) if avg_daily > 0 else 0
@@ -0,0 +1,10 @@
+# Gunicorn settings for serving app:app with eventlet (see README)
+# Socket.IO clients and the in-process caches live in one process, so keep a single worker
+worker_class = 'eventlet'
+workers = 1
+bind = '0.0.0.0:5001'
+
+def post_worker_init(worker):
+    """Start log watching and background processing inside the worker that serves the app"""
+    from app import start_background_services
+    start_background_services()
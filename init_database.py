@@ -7,10 +7,11 @@ This script initializes the database and performs initial data processing.
 import os
 import sys
 from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor
 from database import ChatDatabase
 from chat_processor import ChatProcessor
 
-def main():
+def main(user_pool=None):
     print("Chat Analytics Database Initialization")
     print("=" * 50)
     
@@ -20,7 +21,7 @@ def main():
     print("✓ Database initialized")
     
     # Initialize processor
-    processor = ChatProcessor()
+    processor = ChatProcessor(user_pool=user_pool)
     
     # Check for existing data
     channels = db.get_channels()
@@ -34,7 +35,7 @@ def main():
                 print("✓ Database reset")
                 # Reinitialize
                 db = ChatDatabase()
-                processor = ChatProcessor()
+                processor = ChatProcessor(user_pool=user_pool)
     
     # Process all channels
     print("\nProcessing chat logs...")
@@ -77,4 +78,6 @@ def main():
     print("Run 'python run_server.py' to start the dashboard.")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    # Per-user pattern and word analysis is spread over worker processes
+    with ProcessPoolExecutor() as user_pool:
+        main(user_pool)
\ No newline at end of file
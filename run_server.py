@@ -4,6 +4,13 @@ Chat Analytics Server Runner
 This script provides a simple way to start the chat analytics server.
 """
 
+# Patch the standard library for eventlet before anything imports socket/threading
+try:
+    import eventlet
+    eventlet.monkey_patch()
+except ImportError:
+    pass
+
 import sys
 import os
 import subprocess
@@ -1,7 +1,8 @@
 // Extracted from dashboard.html <script> blocks
 // All dashboard logic, event handlers, and functions go here.
 // WebSocket connection and global state
-const socket = io();
+// The eventlet server always accepts WebSocket, so skip the long-polling handshake
+const socket = io({ transports: ["websocket", "polling"] });
 let allChannelsData = [];
 let currentChannelData = null;
 let selectedChannel = null;
@@ -189,6 +190,11 @@ socket.on("connect", function () {
 	statusDot.classList.remove("disconnected");
 	statusText.textContent = "Connected";
 	console.log("Connected to server");
+
+	// Rejoin the channel view room after a reconnect
+	if (selectedChannel) {
+		requestChannelData(selectedChannel, currentDateFilter);
+	}
 });
 
 socket.on("disconnect", function () {
@@ -202,10 +208,22 @@ socket.on("data_update", function (data) {
 	allChannelsData = data.channels;
 	updateChannelsOverview();
 	updateLastUpdateTime();
+	// The selected channel's data is pushed by the server when it changes
+});
 
-	if (selectedChannel) {
-		requestChannelData(selectedChannel, currentDateFilter);
-	}
+socket.on("data_patch", function (data) {
+	console.log("Data patch received:", data);
+	// Merge the updated channel rows into the current summary
+	const channelsByName = new Map(
+		allChannelsData.map((channel) => [channel.channel, channel])
+	);
+	data.channels.forEach((channel) =>
+		channelsByName.set(channel.channel, channel)
+	);
+	allChannelsData = Array.from(channelsByName.values());
+	updateChannelsOverview();
+	updateLastUpdateTime();
+	// The selected channel's data is pushed by the server when it changes
 });
 
 socket.on("channel_data", function (data) {
@@ -389,6 +407,9 @@ function onChannelChange() {
 	} else {
 		// Hide channel info
 		channelInfo.style.display = "none";
+		if (selectedChannel) {
+			socket.emit("leave_channel_data");
+		}
 		selectedChannel = null;
 		currentDateFilter = null;
 		dateFilterInput.value = "";
@@ -650,6 +671,8 @@ function filterDateSuggestions() {
 // User Detail Popup Functionality
 let currentUserData = null;
 let currentMessagesPage = 1;
+// messageCursors[n - 1] is the cursor that loads page n (page 1 has none)
+let messageCursors = [null];
 let userMessageCache = {};
 
 function openUserDetail(username) {
@@ -669,6 +692,7 @@ function openUserDetail(username) {
 	// Reset to overview tab
 	switchUserTab("overview");
 	currentMessagesPage = 1;
+	messageCursors = [null];
 
 	// Load user details
 	loadUserDetails(username);
@@ -679,7 +703,6 @@ async function loadUserDetails(username) {
 		const currentFilter = buildDateFilterString();
 		const params = new URLSearchParams({
 			channel: selectedChannel,
-			page: 1,
 			limit: 100,
 		});
 
@@ -796,7 +819,8 @@ function populateMessagesTab(data) {
 	// Update pagination
 	const pagination = document.getElementById("messagesPagination");
 	const hasMore = data.pagination.has_more;
-	const currentPage = data.pagination.page;
+	const currentPage = currentMessagesPage;
+	messageCursors[currentPage] = data.pagination.next_cursor;
 
 	pagination.innerHTML = `
 					<button class="pagination-btn" ${currentPage <= 1 ? "disabled" : ""} 
@@ -883,10 +907,14 @@ async function loadUserMessagesPage(page) {
 		const currentFilter = buildDateFilterString();
 		const params = new URLSearchParams({
 			channel: selectedChannel,
-			page: page,
 			limit: 100,
 		});
 
+		const cursor = messageCursors[page - 1];
+		if (cursor) {
+			params.append("cursor", cursor);
+		}
+
 		if (currentFilter) {
 			params.append("date_filter", currentFilter);
 		}
@@ -929,6 +957,7 @@ function closeUserDetail() {
 	document.getElementById("userDetailOverlay").style.display = "none";
 	currentUserData = null;
 	currentMessagesPage = 1;
+	messageCursors = [null];
 }
 
 function filterUserMessages() {
@@ -1,18 +1,25 @@
 import re
 import pandas as pd
+import numpy as np
 import os
+import mmap
 from datetime import datetime, timedelta, date
 from collections import defaultdict
 from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.metrics.pairwise import cosine_similarity
 import sys
 
+NAME_LINE_RE = re.compile(r'^\[\d{2}:\d{2}:\d{2}\] ([^:]+):')
+MESSAGE_LINE_RE = re.compile(r'^\[\d{2}:\d{2}:\d{2}\] ([^:]+): (.*)$')
+TIME_LINES_RE = re.compile(rb'^\[(\d{2}):(\d{2}):(\d{2})\] ([^:\r\n]+):', re.MULTILINE)
+DATE_RE = re.compile(r'(\d{4}-\d{2}-\d{2})')
+
 def tally_chats(log_path):
     chat_counts = {}
     with open(log_path, 'r', encoding='utf-8') as f:
         for line in f:
             # Extract username after timestamp, e.g. [15:28:55] username: message
-            match = re.match(r'^\[\d{2}:\d{2}:\d{2}\] ([^:]+):', line)
+            match = NAME_LINE_RE.match(line)
             if match:
                 name = match.group(1).strip()
                 chat_counts[name] = chat_counts.get(name, 0) + 1
@@ -22,33 +29,48 @@ def collect_user_times_from_counts(channel_path):
     user_times = defaultdict(list)
     for log_file in os.listdir(channel_path):
         if log_file.endswith('.log'):
-            with open(os.path.join(channel_path, log_file), encoding='utf-8') as f:
-                for line in f:
-                    match = re.match(r'^\[(\d{2}:\d{2}:\d{2})\] ([^:]+):', line)
-                    if match:
-                        time_str = match.group(1)
-                        user = match.group(2).strip()
-                        date_match = re.search(r'(\d{4}-\d{2}-\d{2})', log_file)
-                        if date_match:
-                            dt_str = f"{date_match.group(1)} {time_str}"
-                            dt = datetime.strptime(dt_str, "%Y-%m-%d %H:%M:%S")
-                            user_times[user].append(dt)
+            # The date comes from the filename, so files without one have no usable lines
+            date_match = DATE_RE.search(log_file)
+            if not date_match:
+                continue
+            year, month, day = (int(part) for part in date_match.group(1).split('-'))
+            # Scan the mapped file with a bytes pattern and decode only the captured names
+            with open(os.path.join(channel_path, log_file), 'rb') as f:
+                if os.fstat(f.fileno()).st_size == 0:
+                    continue
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    for hour, minute, second, user in TIME_LINES_RE.findall(mm):
+                        dt = datetime(year, month, day, int(hour), int(minute), int(second))
+                        user_times[user.decode('utf-8', 'replace').strip()].append(dt)
     return user_times
 
+def to_sorted_array(times):
+    return np.sort(np.array(times, dtype='datetime64[us]'))
+
 def has_overlap(times1, times2, threshold=timedelta(seconds=2)):
-    i, j = 0, 0
-    times1 = sorted(times1)
-    times2 = sorted(times2)
-    while i < len(times1) and j < len(times2):
-        if abs((times1[i] - times2[j]).total_seconds()) <= threshold.total_seconds():
-            return True
-        if times1[i] < times2[j]:
-            i += 1
-        else:
-            j += 1
-    return False
+    if len(times1) == 0 or len(times2) == 0:
+        return False
+    if not isinstance(times1, np.ndarray):
+        times1 = to_sorted_array(times1)
+    if not isinstance(times2, np.ndarray):
+        times2 = to_sorted_array(times2)
+    threshold = np.timedelta64(threshold)
+    # Time ranges further apart than the threshold cannot overlap
+    if times1[0] - times2[-1] > threshold or times2[0] - times1[-1] > threshold:
+        return False
+    # Overlap is symmetric: look up the shorter array's entries in the longer one
+    if len(times1) > len(times2):
+        times1, times2 = times2, times1
+    # Distance from each of times1 to its nearest neighbour in times2
+    idx = np.searchsorted(times2, times1)
+    right = times2[np.minimum(idx, len(times2) - 1)]
+    left = times2[np.maximum(idx - 1, 0)]
+    nearest = np.minimum(np.abs(right - times1), np.abs(times1 - left))
+    return bool((nearest <= threshold).any())
 
 def group_unique_users(user_times):
+    # Convert each user's times once instead of re-sorting them for every pairing
+    user_times = {user: to_sorted_array(times) for user, times in user_times.items()}
     users = list(user_times.keys())
     n = len(users)
     groups = []
@@ -71,7 +93,7 @@ def collect_user_messages(channel_path, date_filter=None):
         if log_file.endswith('.log'):
             # Date filter logic
             if date_filter:
-                date_match = re.search(r'(\d{4}-\d{2}-\d{2})', log_file)
+                date_match = DATE_RE.search(log_file)
                 if date_match:
                     log_date = date_match.group(1)
                     if ':' in date_filter:
@@ -85,7 +107,7 @@ def collect_user_messages(channel_path, date_filter=None):
                     continue
             with open(os.path.join(channel_path, log_file), encoding='utf-8') as f:
                 for line in f:
-                    match = re.match(r'^\[\d{2}:\d{2}:\d{2}\] ([^:]+): (.*)$', line)
+                    match = MESSAGE_LINE_RE.match(line)
                     if match:
                         user = match.group(1).strip()
                         message = match.group(2).strip()
@@ -188,7 +210,7 @@ def tally_chats_in_folder(channels_dir, output_root, channel_filter=None, date_f
             for log_file in os.listdir(channel_path):
                 if log_file.endswith('.log'):
                     # Extract date from filename, expects format: channel-YYYY-MM-DD.log
-                    date_match = re.search(r'(\d{4}-\d{2}-\d{2})', log_file)
+                    date_match = DATE_RE.search(log_file)
                     if date_match:
                         log_date = date_match.group(1)
                         # Date filter logic